@@ -1,47 +1,218 @@
 # -*- coding: utf-8 -*-
 import os
+import copy
 import json
+import queue
+import atexit
+import time
+import asyncio
 import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Union
 import logging
 
+# orjson's C parser is 2-5x faster than stdlib json; fall back quietly
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# ijson streams top-level keys of large migration files without holding
+# the whole document in memory; optional, like orjson
+try:
+    import ijson as _ijson
+except ImportError:
+    _ijson = None
+
 # Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('database')
 
 # Database constants
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'dao_bot.db')
 
+# Hot-path SQL hoisted to module level so the same interned string is passed
+# to execute() every call, keeping sqlite3's prepared-statement cache warm
+_SQL_GET_USER = """
+SELECT u.user_id, COALESCE(b.cash, u.cash, 0) AS cash, COALESCE(b.bank, u.bank, 0) AS bank,
+       u.job, u.last_cultivate, u.last_collect, u.message_count, u.created_at, u.updated_at
+FROM users u LEFT JOIN user_balances b ON b.user_id = u.user_id
+WHERE u.user_id = ?
+"""
+_SQL_GET_META = "SELECT meta_value FROM user_meta WHERE user_id = ? AND meta_key = ?"
+_SQL_GET_INVENTORY = "SELECT * FROM inventory WHERE user_id = ?"
+_SQL_GET_BALANCE = "SELECT cash, bank FROM user_balances WHERE user_id = ?"
+_SQL_ENSURE_USER = "INSERT OR IGNORE INTO users (user_id) VALUES (?)"
+@lru_cache(maxsize=1024)
+def _parse_json_cached(s: Union[str, bytes]) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+def _parse_json(s: Union[str, bytes]) -> Any:
+    """Parse a JSON string, caching the parse keyed on the raw text.
+
+    SQLite hands back the stored text verbatim, so repeated reads of the
+    same metadata skip re-parsing. Every row storing identical text
+    shares one cache entry, so container results are deep-copied at this
+    boundary: callers get a private object they can mutate (the usual
+    get -> mutate -> set pattern) without corrupting what other rows'
+    reads return. Writers still clear the cache on update.
+    """
+    value = _parse_json_cached(s)
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+_parse_json.cache_clear = _parse_json_cached.cache_clear
+
+
+_EMPTY_JSON = '{}'
+
+
+def _dump_json(obj: Any) -> str:
+    """Serialize to compact JSON, skipping the encoder for the common {} case"""
+    if isinstance(obj, dict) and not obj:
+        return _EMPTY_JSON
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'))
+
+
+_SQL_UPSERT_DELTA = {
+    field: (f"INSERT INTO user_balances (user_id, {field}) VALUES (?, MAX(0, ?)) "
+            f"ON CONFLICT(user_id) DO UPDATE SET {field} = MAX(0, user_balances.{field} + ?)")
+    for field in ("cash", "bank")
+}
+
+# Columns declared as JSON decode in the sqlite3 layer on fetch, so read
+# paths get a dict without a Python-side loads call. TIMESTAMP stays the
+# stored string - the identity converter opts out of sqlite3's datetime
+# conversion that PARSE_DECLTYPES would otherwise switch on.
+sqlite3.register_converter("JSON", _parse_json)
+sqlite3.register_converter("TIMESTAMP", lambda b: b.decode('utf-8'))
+
 class Database:
     """Database handler for the Discord bot using SQLite"""
-    
+
+    # Number of read-only connections; WAL lets these run concurrently
+    # with the single writer
+    READER_POOL_SIZE = 4
+
+    # How long a cached sect roster stays fresh (seconds)
+    SECT_MEMBERS_CACHE_TTL = 30
+
     def __init__(self, db_path: str = DB_PATH):
         """Initialize the database connection"""
         self.db_path = db_path
         self.conn = None
         self.cursor = None
+        self._readers = None
+        self._txn_state = threading.local()
+        self._write_lock = threading.RLock()
+        self._sect_members_cache: Dict[str, tuple] = {}
+        # Statement text memoized per (table, field-set) so each distinct
+        # update shape is built - and prepared by SQLite - exactly once
+        self._update_sql_cache: Dict[tuple, str] = {}
+        # Signature of the last update applied per tournament, used to
+        # skip no-op rewrites (cleared wholesale when it grows too big)
+        self._tournament_update_sig: Dict[str, int] = {}
         self._connect()
         self._create_tables()
+        self._connect_readers()
     
     def _connect(self):
         """Connect to the SQLite database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False,
+                                        cached_statements=512,
+                                        detect_types=sqlite3.PARSE_DECLTYPES)
             self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            # Kept only for external callers that poke at db.cursor;
+            # internal code runs conn.execute(), which hands each
+            # statement its own cursor so interleaved calls can't clobber
+            # one another's pending result sets
             self.cursor = self.conn.cursor()
-            logger.info(f"Connected to database at {self.db_path}")
+
+            # Applied to every connection: contending writers wait out the
+            # busy_timeout instead of failing with "database is locked",
+            # which pairs with transaction()'s BEGIN IMMEDIATE taking the
+            # write lock upfront.
+            self.conn.executescript('''
+            PRAGMA foreign_keys=ON;
+            PRAGMA busy_timeout=5000;
+            ''')
+
+            # Tune file-backed databases for a write-heavy bot workload.
+            # WAL lets readers run concurrently with the writer, and
+            # synchronous=NORMAL is safe under WAL while skipping the
+            # per-commit fsync of the main database file.
+            if not self.db_path.endswith(':memory:'):
+                self.conn.executescript('''
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA mmap_size=268435456;
+                PRAGMA cache_size=-65536;
+                ''')
+            logger.info("Connected to database at %s", self.db_path)
         except sqlite3.Error as e:
-            logger.error(f"Database connection error: {e}")
+            logger.error("Database connection error: %s", e)
             raise
     
+    # Tables carrying Discord IDs, in FK-safe copy order; used when
+    # rebuilding a legacy database that stored the IDs as TEXT
+    _ID_TABLES = ("users", "user_balances", "user_stats", "user_meta",
+                  "inventory", "user_jobs", "sects", "sect_members",
+                  "tournaments", "tournament_participants")
+
+    def _stash_legacy_text_id_tables(self) -> List[str]:
+        """If the on-disk schema predates INTEGER user IDs, rename the
+        affected tables aside so they can be rebuilt with the new column
+        types. Returns the list of stashed tables (empty on fresh/current
+        databases)."""
+        cur = self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'users'")
+        if not cur.fetchone():
+            return []
+        cur = self.conn.execute("PRAGMA table_info(users)")
+        id_type = {row[1]: (row[2] or '').upper() for row in cur.fetchall()}
+        if id_type.get('user_id') != 'TEXT':
+            return []
+
+        logger.info("Rebuilding tables with INTEGER Discord IDs...")
+        self.conn.execute("PRAGMA foreign_keys=OFF")
+        stashed = []
+        for table in self._ID_TABLES:
+            cur = self.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,))
+            if cur.fetchone():
+                self.conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+                stashed.append(table)
+        return stashed
+
+    def _restore_legacy_tables(self, stashed: List[str]) -> None:
+        """Copy rows from the stashed TEXT-ID tables into the rebuilt
+        schema. INTEGER column affinity converts the numeric snowflake
+        strings on the way in."""
+        for table in stashed:
+            self.conn.execute(f"INSERT INTO {table} SELECT * FROM {table}_legacy")
+            self.conn.execute(f"DROP TABLE {table}_legacy")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        logger.info("Rebuilt %s tables with INTEGER IDs", len(stashed))
+
     def _create_tables(self):
         """Create necessary tables if they don't exist"""
         try:
+            stashed = self._stash_legacy_text_id_tables()
+
             # Users table - stores basic user information
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS users (
-                user_id TEXT PRIMARY KEY,
+                user_id INTEGER PRIMARY KEY,
                 cash INTEGER DEFAULT 0,
                 bank INTEGER DEFAULT 0,
                 job TEXT DEFAULT NULL,
@@ -53,10 +224,33 @@ class Database:
             )
             ''')
             
+            # Hot balance table - the frequently mutated numeric columns
+            # live in a narrow row of their own, so balance writes don't
+            # rewrite the wide users row (or its updated_at timestamp)
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS user_balances (
+                user_id INTEGER PRIMARY KEY,
+                cash INTEGER NOT NULL DEFAULT 0,
+                bank INTEGER NOT NULL DEFAULT 0
+            )
+            ''')
+
+            # Typed columns for the hottest per-user stats - reads return
+            # a plain value with no JSON parse, and the columns stay
+            # indexable for leaderboards. Everything else lives in user_meta.
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS user_stats (
+                user_id INTEGER PRIMARY KEY,
+                cultivation_level INTEGER DEFAULT 0,
+                energy INTEGER DEFAULT 0,
+                last_seen TEXT DEFAULT NULL
+            )
+            ''')
+
             # User metadata table - stores additional user data as JSON
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS user_meta (
-                user_id TEXT,
+                user_id INTEGER,
                 meta_key TEXT,
                 meta_value TEXT,  -- JSON string
                 PRIMARY KEY (user_id, meta_key),
@@ -65,10 +259,10 @@ class Database:
             ''')
             
             # Inventory table - stores user inventory items
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS inventory (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT,
+                user_id INTEGER,
                 item_name TEXT,
                 quantity INTEGER DEFAULT 1,
                 rarity TEXT DEFAULT 'common',
@@ -78,7 +272,7 @@ class Database:
             ''')
             
             # Jobs table - stores job definitions
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS jobs (
                 job_name TEXT PRIMARY KEY,
                 min_pay INTEGER,
@@ -87,9 +281,9 @@ class Database:
             ''')
             
             # User jobs table - stores user job progress
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS user_jobs (
-                user_id TEXT,
+                user_id INTEGER,
                 job_name TEXT,
                 xp INTEGER DEFAULT 0,
                 rank TEXT DEFAULT 'apprentice',
@@ -101,11 +295,11 @@ class Database:
             ''')
             
             # Sects table - stores sect information
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS sects (
                 sect_id TEXT PRIMARY KEY,
                 name TEXT,
-                leader_id TEXT,
+                leader_id INTEGER,
                 description TEXT DEFAULT '',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 level INTEGER DEFAULT 1,
@@ -115,10 +309,10 @@ class Database:
             ''')
             
             # Sect members table - stores sect membership
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS sect_members (
                 sect_id TEXT,
-                user_id TEXT,
+                user_id INTEGER,
                 role TEXT DEFAULT 'member',  -- 'leader', 'elder', 'member'
                 joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (sect_id, user_id),
@@ -128,7 +322,7 @@ class Database:
             ''')
             
             # Store items table - stores store items
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS store_items (
                 item_name TEXT PRIMARY KEY,
                 price INTEGER,
@@ -141,24 +335,24 @@ class Database:
             ''')
             
             # Tournaments table - stores tournament information
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS tournaments (
                 tournament_id TEXT PRIMARY KEY,
-                host_id TEXT,
+                host_id INTEGER,
                 title TEXT,
                 description TEXT DEFAULT '',
                 status TEXT DEFAULT 'recruiting',  -- 'recruiting', 'active', 'completed'
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                winner_id TEXT DEFAULT NULL,
-                reward_data TEXT DEFAULT '{}'  -- JSON string for reward data
+                winner_id INTEGER DEFAULT NULL,
+                reward_data JSON DEFAULT '{}'  -- decoded by the JSON converter on fetch
             )
             ''')
             
             # Tournament participants table - stores tournament participants
-            self.cursor.execute('''
+            self.conn.execute('''
             CREATE TABLE IF NOT EXISTS tournament_participants (
                 tournament_id TEXT,
-                participant_id TEXT,  -- can be user_id or bot_id (negative)
+                participant_id INTEGER,  -- can be user_id or bot_id (negative)
                 joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 is_bot INTEGER DEFAULT 0,  -- 0 for user, 1 for bot
                 bot_name TEXT DEFAULT NULL,  -- only for bots
@@ -166,168 +360,447 @@ class Database:
                 FOREIGN KEY (tournament_id) REFERENCES tournaments(tournament_id) ON DELETE CASCADE
             )
             ''')
-            
-            # Commit the changes
-            self.conn.commit()
+
+            if stashed:
+                self._restore_legacy_tables(stashed)
+
+            # One-time backfill from databases that predate the balance split
+            self.conn.execute('''
+            INSERT OR IGNORE INTO user_balances (user_id, cash, bank)
+                SELECT user_id, COALESCE(cash, 0), COALESCE(bank, 0) FROM users
+            ''')
+
+            # Indexes for the lookups the accessors actually run - without
+            # these, get_inventory and the reverse membership lookups scan
+            # their whole tables
+            self._ensure_unique_inventory_index()
+            self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_sect_members_user ON sect_members(user_id)
+            ''')
+            self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_tournaments_status ON tournaments(status)
+            ''')
+            # tournament_participants needs no extra index: its composite
+            # PRIMARY KEY (tournament_id, participant_id) already backs
+            # both the per-tournament listing and the two-column delete
+
+            # Refresh planner statistics so the new indexes get picked
+            self.conn.execute("ANALYZE")
+
             logger.info("Database tables created successfully")
         except sqlite3.Error as e:
-            logger.error(f"Error creating tables: {e}")
-            self.conn.rollback()
+            logger.error("Error creating tables: %s", e)
             raise
+
+    def _ensure_unique_inventory_index(self):
+        """Make (user_id, item_name, rarity) a unique key on inventory.
+
+        add_inventory_item upserts against this key. Older databases may
+        carry a non-unique version of the index and/or duplicate rows, so
+        merge duplicates (summing quantities) before creating the index.
+        """
+        for row in self.conn.execute("PRAGMA index_list(inventory)").fetchall():
+            if row['name'] == 'idx_inventory_user' and row['unique']:
+                return
+
+        # Merge duplicate stacks into the oldest row, then drop the rest
+        self.conn.execute('''
+        UPDATE inventory SET quantity = (
+            SELECT SUM(i2.quantity) FROM inventory i2
+            WHERE i2.user_id = inventory.user_id
+              AND i2.item_name = inventory.item_name
+              AND i2.rarity = inventory.rarity
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM inventory
+            GROUP BY user_id, item_name, rarity HAVING COUNT(*) > 1
+        )
+        ''')
+        self.conn.execute('''
+        DELETE FROM inventory WHERE id NOT IN (
+            SELECT MIN(id) FROM inventory GROUP BY user_id, item_name, rarity
+        )
+        ''')
+        self.conn.execute("DROP INDEX IF EXISTS idx_inventory_user")
+        self.conn.execute(
+            "CREATE UNIQUE INDEX idx_inventory_user ON inventory(user_id, item_name, rarity)"
+        )
     
+    def _connect_readers(self):
+        """Open the pool of read-only connections.
+
+        Skipped for in-memory databases, where each connection would see
+        its own private database - reads fall back to the writer there.
+        """
+        if self.db_path.endswith(':memory:'):
+            return
+        try:
+            pool = queue.Queue(maxsize=self.READER_POOL_SIZE)
+            for _ in range(self.READER_POOL_SIZE):
+                conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                       cached_statements=512,
+                                       detect_types=sqlite3.PARSE_DECLTYPES)
+                conn.row_factory = sqlite3.Row
+                conn.executescript('''
+                PRAGMA query_only=1;
+                PRAGMA busy_timeout=5000;
+                PRAGMA cache_size=-16384;
+                ''')
+                pool.put(conn)
+            self._readers = pool
+        except sqlite3.Error as e:
+            logger.error("Error opening reader pool: %s", e)
+            self._readers = None
+
+    # Nesting depth of the *calling* thread's transaction. Thread-local
+    # on purpose: a thread that calls transaction() while another thread
+    # is mid-transaction must see depth 0 and block on _write_lock for a
+    # transaction of its own, not silently join the foreign one - and
+    # _read_cursor must only reroute the owning thread's reads onto the
+    # writer connection.
+    @property
+    def _txn_depth(self) -> int:
+        return getattr(self._txn_state, 'depth', 0)
+
+    @_txn_depth.setter
+    def _txn_depth(self, value: int) -> None:
+        self._txn_state.depth = value
+
+    @contextmanager
+    def _read_cursor(self):
+        """Check out a cursor for a read-only query.
+
+        Reads go through the reader pool so they never queue behind the
+        writer. Inside an open transaction (or when there is no pool)
+        they fall back to the writer connection, keeping uncommitted
+        writes visible to the caller.
+        """
+        if self._readers is None or self._txn_depth:
+            yield self.conn.cursor()
+            return
+
+        conn = self._readers.get()
+        try:
+            yield conn.cursor()
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Group several mutations into a single transaction (one fsync).
+
+        Usage:
+            with db.transaction():
+                db.add_cash(user_id, 100)
+                db.add_inventory_item(user_id, "Healing Potion")
+
+        Nested calls join the outermost transaction. Outside of this
+        context manager every statement autocommits individually.
+        """
+        if self._txn_depth:
+            # Already inside a transaction - just join it
+            self._txn_depth += 1
+            try:
+                yield
+            finally:
+                self._txn_depth -= 1
+            return
+
+        # Serialize writer threads at the application level, then grab the
+        # SQLite write lock upfront so concurrent processes wait
+        # (busy_timeout) instead of failing mid-transaction
+        with self._write_lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._txn_depth = 1
+            try:
+                yield
+            except Exception:
+                self.conn.rollback()
+                raise
+            else:
+                self.conn.commit()
+            finally:
+                self._txn_depth = 0
+
+    # Rows handed to one executemany call at a time. Parameters bind per
+    # row, so SQLite's variable limit is never at risk; chunking just
+    # bounds the batch the bulk helpers buffer when sources stream.
+    BULK_CHUNK_SIZE = 500
+
+    def _executemany_chunked(self, sql: str, rows: List[tuple]) -> None:
+        """Run executemany over rows in fixed-size chunks"""
+        for i in range(0, len(rows), self.BULK_CHUNK_SIZE):
+            self.conn.executemany(sql, rows[i:i + self.BULK_CHUNK_SIZE])
+
+    async def run(self, fn, *args):
+        """Run a blocking database call in the default executor.
+
+        Lets async command handlers do e.g.
+        ``await db.run(db.add_cash, user_id, 100)`` so the event loop
+        never blocks on an fsync. The connection is opened with
+        check_same_thread=False; grouped mutations offloaded this way
+        should go through transaction(), which holds the write lock.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
     def close(self):
         """Close the database connection"""
+        if self._readers is not None:
+            while not self._readers.empty():
+                self._readers.get_nowait().close()
+            self._readers = None
         if self.conn:
             self.conn.close()
+            self.conn = None
             logger.info("Database connection closed")
     
     # User data methods
     def get_user(self, user_id: Union[int, str]) -> Dict[str, Any]:
         """Get user data from the database"""
-        user_id = str(user_id)
         try:
-            self.cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-            user = self.cursor.fetchone()
-            
+            with self._read_cursor() as cur:
+                cur.execute(_SQL_GET_USER, (user_id,))
+                user = cur.fetchone()
+
             if user:
                 return dict(user)
             else:
                 # Create new user if not exists
-                self.cursor.execute(
-                    "INSERT INTO users (user_id, cash, bank) VALUES (?, 0, 0)",
-                    (user_id,)
-                )
-                self.conn.commit()
-                return {"user_id": user_id, "cash": 0, "bank": 0, "job": None, 
+                with self._write_lock:
+                    self.conn.execute(
+                        "INSERT INTO users (user_id, cash, bank) VALUES (?, 0, 0)",
+                        (user_id,)
+                    )
+                return {"user_id": user_id, "cash": 0, "bank": 0, "job": None,
                         "last_cultivate": None, "last_collect": None, "message_count": 0}
         except sqlite3.Error as e:
-            logger.error(f"Error getting user {user_id}: {e}")
-            self.conn.rollback()
-            return {"user_id": user_id, "cash": 0, "bank": 0, "job": None, 
+            logger.error("Error getting user %s: %s", user_id, e)
+            return {"user_id": user_id, "cash": 0, "bank": 0, "job": None,
                     "last_cultivate": None, "last_collect": None, "message_count": 0}
     
+    # Columns that callers are allowed to write through update_user
+    USER_FIELDS = ("cash", "bank", "job", "last_cultivate", "last_collect", "message_count")
+
+    # Hot columns routed to the narrow user_balances table
+    BALANCE_FIELDS = ("cash", "bank")
+
+    def _user_upsert_sql(self, fields: tuple) -> str:
+        """Build (and memoize) the user UPSERT for a given field set"""
+        key = ('users', fields)
+        query = self._update_sql_cache.get(key)
+        if query is None:
+            columns = ', '.join(fields)
+            placeholders = ', '.join('?' * len(fields))
+            updates = ', '.join(f"{field} = excluded.{field}" for field in fields)
+            query = (f"INSERT INTO users (user_id, {columns}) VALUES (?, {placeholders}) "
+                     f"ON CONFLICT(user_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP")
+            self._update_sql_cache[key] = query
+        return query
+
+    def _balance_upsert_sql(self, fields: tuple) -> str:
+        """Build (and memoize) the balance UPSERT for a given field set"""
+        key = ('user_balances', fields)
+        query = self._update_sql_cache.get(key)
+        if query is None:
+            columns = ', '.join(fields)
+            placeholders = ', '.join('?' * len(fields))
+            updates = ', '.join(f"{field} = excluded.{field}" for field in fields)
+            query = (f"INSERT INTO user_balances (user_id, {columns}) VALUES (?, {placeholders}) "
+                     f"ON CONFLICT(user_id) DO UPDATE SET {updates}")
+            self._update_sql_cache[key] = query
+        return query
+
     def update_user(self, user_id: Union[int, str], data: Dict[str, Any]) -> bool:
         """Update user data in the database"""
-        user_id = str(user_id)
         try:
-            # Get existing user or create if not exists
-            user = self.get_user(user_id)
-            
-            # Build the update query dynamically based on provided data
-            fields = []
-            values = []
-            for key, value in data.items():
-                if key in user and key != 'user_id':
-                    fields.append(f"{key} = ?")
-                    values.append(value)
-            
+            # Whitelist and normalize field order so equivalent updates
+            # share one cached statement
+            fields = tuple(field for field in self.USER_FIELDS if field in data)
+
             if not fields:
                 return True  # Nothing to update
-            
-            fields.append("updated_at = CURRENT_TIMESTAMP")
-            query = f"UPDATE users SET {', '.join(fields)} WHERE user_id = ?"
-            values.append(user_id)
-            
-            self.cursor.execute(query, values)
-            self.conn.commit()
+
+            balance_fields = tuple(f for f in fields if f in self.BALANCE_FIELDS)
+            profile_fields = tuple(f for f in fields if f not in self.BALANCE_FIELDS)
+
+            # Atomic UPSERTs - create the rows if missing, update them
+            # otherwise, without a preliminary SELECT. Balance columns go
+            # to the narrow hot table so they don't rewrite the wide row.
+            with self.transaction():
+                if profile_fields:
+                    query = self._user_upsert_sql(profile_fields)
+                    self.conn.execute(query, [user_id] + [data[field] for field in profile_fields])
+                else:
+                    self._ensure_user(user_id)
+                if balance_fields:
+                    query = self._balance_upsert_sql(balance_fields)
+                    self.conn.execute(query, [user_id] + [data[field] for field in balance_fields])
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating user {user_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error updating user %s: %s", user_id, e)
             return False
+
+    def bulk_update_users(self, users: Dict[Union[int, str], Dict[str, Any]]) -> bool:
+        """Update many users in one transaction.
+
+        Takes ``{user_id: {field: value}}`` with the same whitelist and
+        hot/cold split as update_user. Rows are grouped by field set so
+        each group runs as a single executemany against the memoized
+        UPSERT - one statement compile and one commit for the whole
+        batch instead of a method call per user.
+        """
+        if not users:
+            return True
+
+        try:
+            profile_groups: Dict[tuple, list] = {}
+            balance_groups: Dict[tuple, list] = {}
+            for user_id, data in users.items():
+                fields = tuple(field for field in self.USER_FIELDS if field in data)
+                if not fields:
+                    continue
+                balance_fields = tuple(f for f in fields if f in self.BALANCE_FIELDS)
+                profile_fields = tuple(f for f in fields if f not in self.BALANCE_FIELDS)
+                if profile_fields:
+                    profile_groups.setdefault(profile_fields, []).append(
+                        [user_id] + [data[f] for f in profile_fields])
+                else:
+                    profile_groups.setdefault((), []).append((user_id,))
+                if balance_fields:
+                    balance_groups.setdefault(balance_fields, []).append(
+                        [user_id] + [data[f] for f in balance_fields])
+
+            with self.transaction():
+                for fields, rows in profile_groups.items():
+                    if fields:
+                        self._executemany_chunked(self._user_upsert_sql(fields), rows)
+                    else:
+                        self._executemany_chunked(_SQL_ENSURE_USER, rows)
+                for fields, rows in balance_groups.items():
+                    self._executemany_chunked(self._balance_upsert_sql(fields), rows)
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error bulk-updating %d users: %s", len(users), e)
+            return False
+
+    def _ensure_user(self, user_id: Union[int, str]) -> None:
+        """Make sure a users row exists, without the SELECT round-trip of
+        get_user - a single INSERT OR IGNORE"""
+        with self._write_lock:
+            self.conn.execute(_SQL_ENSURE_USER, (user_id,))
+
+    def _upsert_delta(self, field: str, user_id: Union[int, str], amount: int) -> None:
+        """Atomically apply a delta to a balance column, clamped at zero,
+        creating the user row if it doesn't exist yet"""
+        with self._write_lock:
+            # The users row must exist too: the economy snapshot scans
+            # FROM users, and other tables reference it - a balance-only
+            # row would make this user invisible to both
+            self.conn.execute(_SQL_ENSURE_USER, (user_id,))
+            self.conn.execute(_SQL_UPSERT_DELTA[field], (user_id, amount, amount))
     
     def get_user_meta(self, user_id: Union[int, str], meta_key: str) -> Any:
         """Get user metadata from the database"""
-        user_id = str(user_id)
         try:
-            self.cursor.execute(
-                "SELECT meta_value FROM user_meta WHERE user_id = ? AND meta_key = ?",
-                (user_id, meta_key)
-            )
-            result = self.cursor.fetchone()
+            with self._read_cursor() as cur:
+                cur.execute(_SQL_GET_META, (user_id, meta_key))
+                result = cur.fetchone()
             
             if result:
-                return json.loads(result['meta_value'])
+                return _parse_json(result['meta_value'])
             return None
         except sqlite3.Error as e:
-            logger.error(f"Error getting user meta {user_id}.{meta_key}: {e}")
+            logger.error("Error getting user meta %s.%s: %s", user_id, meta_key, e)
             return None
     
     def set_user_meta(self, user_id: Union[int, str], meta_key: str, meta_value: Any) -> bool:
         """Set user metadata in the database"""
-        user_id = str(user_id)
         try:
-            # Ensure user exists
-            self.get_user(user_id)
-            
             # Convert value to JSON string
-            json_value = json.dumps(meta_value)
-            
-            # Use UPSERT pattern (INSERT OR REPLACE)
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO user_meta (user_id, meta_key, meta_value) VALUES (?, ?, ?)",
-                (user_id, meta_key, json_value)
-            )
-            self.conn.commit()
+            json_value = _dump_json(meta_value)
+
+            with self.transaction():
+                self._ensure_user(user_id)
+
+                # Use UPSERT pattern (INSERT OR REPLACE)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO user_meta (user_id, meta_key, meta_value) VALUES (?, ?, ?)",
+                    (user_id, meta_key, json_value)
+                )
+
+            _parse_json.cache_clear()
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error setting user meta {user_id}.{meta_key}: {e}")
-            self.conn.rollback()
+            logger.error("Error setting user meta %s.%s: %s", user_id, meta_key, e)
             return False
-    
+
+    # Keys promoted out of the user_meta JSON blobs into typed columns
+    STAT_FIELDS = ("cultivation_level", "energy", "last_seen")
+
+    def get_user_stat(self, user_id: Union[int, str], key: str) -> Any:
+        """Get a per-user stat, reading the typed user_stats column when
+        the key has one and falling back to user_meta otherwise"""
+        if key not in self.STAT_FIELDS:
+            return self.get_user_meta(user_id, key)
+        try:
+            with self._read_cursor() as cur:
+                cur.execute(f"SELECT {key} FROM user_stats WHERE user_id = ?",
+                            (user_id,))
+                row = cur.fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error("Error getting stat %s for user %s: %s", key, user_id, e)
+            return None
+
+    def set_user_stat(self, user_id: Union[int, str], key: str, value: Any) -> bool:
+        """Set a per-user stat, routing known keys to their typed column"""
+        if key not in self.STAT_FIELDS:
+            return self.set_user_meta(user_id, key, value)
+        try:
+            with self._write_lock:
+                self.conn.execute(
+                    f"INSERT INTO user_stats (user_id, {key}) VALUES (?, ?) "
+                    f"ON CONFLICT(user_id) DO UPDATE SET {key} = excluded.{key}",
+                    (user_id, value)
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error setting stat %s for user %s: %s", key, user_id, e)
+            return False
+
     # Economy methods
     def get_balance(self, user_id: Union[int, str]) -> tuple[int, int]:
-        """Get user's cash and bank balance"""
-        user = self.get_user(user_id)
-        
-        # Ensure cash and bank are always present and are integers
-        cash = user.get('cash')
-        if cash is None:
-            cash = 0
-        else:
-            try:
-                cash = int(cash)
-            except (ValueError, TypeError):
-                cash = 0
-                
-        bank = user.get('bank')
-        if bank is None:
-            bank = 0
-        else:
-            try:
-                bank = int(bank)
-            except (ValueError, TypeError):
-                bank = 0
-                
-        return cash, bank
+        """Get user's cash and bank balance.
+
+        Pure read: fetches just the two columns and reports (0, 0) for
+        unknown users without creating a row - the first write upserts it.
+        """
+        try:
+            with self._read_cursor() as cur:
+                cur.execute(_SQL_GET_BALANCE, (user_id,))
+                row = cur.fetchone()
+            if row is None:
+                return 0, 0
+            return int(row[0] or 0), int(row[1] or 0)
+        except sqlite3.Error as e:
+            logger.error("Error getting balance for user %s: %s", user_id, e)
+            return 0, 0
     
     def add_cash(self, user_id: Union[int, str], amount: int) -> bool:
         """Add cash to user's balance"""
-        user_id = str(user_id)
+        # Validate once at the boundary; the column itself is INTEGER typed
         try:
-            # Ensure amount is an integer
-            try:
-                amount = int(amount)
-            except (ValueError, TypeError):
-                logger.warning(f"Invalid amount {amount} for user {user_id}, using 0")
-                amount = 0
-                
-            user = self.get_user(user_id)
-            
-            # Ensure cash is an integer
-            cash = user.get('cash')
-            if cash is None:
-                cash = 0
-            else:
-                try:
-                    cash = int(cash)
-                except (ValueError, TypeError):
-                    cash = 0
-                    
-            new_cash = max(0, cash + amount)  # Prevent negative cash
-            return self.update_user(user_id, {"cash": new_cash})
-        except Exception as e:
-            logger.error(f"Error adding cash to user {user_id}: {e}")
+            amount = int(amount)
+        except (ValueError, TypeError):
+            logger.warning("Invalid amount %s for user %s, using 0", amount, user_id)
+            amount = 0
+
+        try:
+            self._upsert_delta('cash', user_id, amount)
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error adding cash to user %s: %s", user_id, e)
             return False
     
     def set_cash(self, user_id: Union[int, str], amount: int) -> bool:
@@ -335,7 +808,7 @@ class Database:
         try:
             amount = int(amount)
         except (ValueError, TypeError):
-            logger.warning(f"Invalid amount {amount} for user {user_id}, using 0")
+            logger.warning("Invalid amount %s for user %s, using 0", amount, user_id)
             amount = 0
             
         amount = max(0, amount)  # Prevent negative cash
@@ -343,31 +816,18 @@ class Database:
     
     def add_bank(self, user_id: Union[int, str], amount: int) -> bool:
         """Add money to user's bank balance"""
-        user_id = str(user_id)
+        # Validate once at the boundary; the column itself is INTEGER typed
         try:
-            # Ensure amount is an integer
-            try:
-                amount = int(amount)
-            except (ValueError, TypeError):
-                logger.warning(f"Invalid amount {amount} for user {user_id}, using 0")
-                amount = 0
-                
-            user = self.get_user(user_id)
-            
-            # Ensure bank is an integer
-            bank = user.get('bank')
-            if bank is None:
-                bank = 0
-            else:
-                try:
-                    bank = int(bank)
-                except (ValueError, TypeError):
-                    bank = 0
-                    
-            new_bank = max(0, bank + amount)  # Prevent negative bank
-            return self.update_user(user_id, {"bank": new_bank})
-        except Exception as e:
-            logger.error(f"Error adding bank to user {user_id}: {e}")
+            amount = int(amount)
+        except (ValueError, TypeError):
+            logger.warning("Invalid amount %s for user %s, using 0", amount, user_id)
+            amount = 0
+
+        try:
+            self._upsert_delta('bank', user_id, amount)
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error adding bank to user %s: %s", user_id, e)
             return False
     
     def set_bank(self, user_id: Union[int, str], amount: int) -> bool:
@@ -375,71 +835,86 @@ class Database:
         try:
             amount = int(amount)
         except (ValueError, TypeError):
-            logger.warning(f"Invalid amount {amount} for user {user_id}, using 0")
+            logger.warning("Invalid amount %s for user %s, using 0", amount, user_id)
             amount = 0
             
         amount = max(0, amount)  # Prevent negative bank
         return self.update_user(user_id, {"bank": amount})
     
     # Inventory methods
-    def get_inventory(self, user_id: Union[int, str]) -> List[Dict[str, Any]]:
-        """Get user's inventory items"""
-        user_id = str(user_id)
+    def get_inventory(self, user_id: Union[int, str]) -> List[sqlite3.Row]:
+        """Get user's inventory items.
+
+        Rows support mapping access (item['item_name']) without the cost
+        of materializing a dict per row.
+        """
         try:
-            self.cursor.execute(
-                "SELECT * FROM inventory WHERE user_id = ?",
-                (user_id,)
-            )
-            items = self.cursor.fetchall()
-            return [dict(item) for item in items]
+            with self._read_cursor() as cur:
+                cur.execute(_SQL_GET_INVENTORY, (user_id,))
+                return cur.fetchall()
         except sqlite3.Error as e:
-            logger.error(f"Error getting inventory for user {user_id}: {e}")
+            logger.error("Error getting inventory for user %s: %s", user_id, e)
             return []
     
     def add_inventory_item(self, user_id: Union[int, str], item_name: str, 
                           quantity: int = 1, rarity: str = 'common', 
                           metadata: Dict[str, Any] = None) -> bool:
         """Add an item to user's inventory"""
-        user_id = str(user_id)
         if metadata is None:
             metadata = {}
         
         try:
-            # Ensure user exists
-            self.get_user(user_id)
-            
-            # Check if item already exists
-            self.cursor.execute(
-                "SELECT id, quantity FROM inventory WHERE user_id = ? AND item_name = ? AND rarity = ?",
-                (user_id, item_name, rarity)
-            )
-            existing_item = self.cursor.fetchone()
-            
-            if existing_item:
-                # Update quantity
-                new_quantity = existing_item['quantity'] + quantity
-                self.cursor.execute(
-                    "UPDATE inventory SET quantity = ? WHERE id = ?",
-                    (new_quantity, existing_item['id'])
-                )
-            else:
-                # Insert new item
-                self.cursor.execute(
-                    "INSERT INTO inventory (user_id, item_name, quantity, rarity, metadata) VALUES (?, ?, ?, ?, ?)",
-                    (user_id, item_name, quantity, rarity, json.dumps(metadata))
+            with self.transaction():
+                self._ensure_user(user_id)
+
+                # Single atomic UPSERT against the (user_id, item_name, rarity)
+                # unique key - stacks onto an existing row, inserts otherwise
+                self.conn.execute(
+                    "INSERT INTO inventory (user_id, item_name, quantity, rarity, metadata) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(user_id, item_name, rarity) DO UPDATE SET quantity = quantity + excluded.quantity",
+                    (user_id, item_name, quantity, rarity, _dump_json(metadata))
                 )
-            
-            self.conn.commit()
+
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error adding inventory item for user {user_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error adding inventory item for user %s: %s", user_id, e)
             return False
     
-    def remove_inventory_item(self, user_id: Union[int, str], item_name: str, 
+    def add_inventory_items(self, user_id: Union[int, str],
+                            items: List[tuple]) -> bool:
+        """Add many items to a user's inventory in one transaction.
+
+        Each entry is (item_name, quantity, rarity, metadata); quantity,
+        rarity and metadata may be omitted. One prepared statement and one
+        fsync regardless of how many items are dropped.
+        """
+        if not items:
+            return True
+
+        try:
+            rows = []
+            for item in items:
+                item_name = item[0]
+                quantity = item[1] if len(item) > 1 else 1
+                rarity = item[2] if len(item) > 2 else 'common'
+                metadata = item[3] if len(item) > 3 and item[3] else {}
+                rows.append((user_id, item_name, quantity, rarity, _dump_json(metadata)))
+
+            with self.transaction():
+                self._ensure_user(user_id)
+                self._executemany_chunked(
+                    "INSERT INTO inventory (user_id, item_name, quantity, rarity, metadata) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(user_id, item_name, rarity) DO UPDATE SET quantity = quantity + excluded.quantity",
+                    rows
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error bulk-adding inventory items for user %s: %s", user_id, e)
+            return False
+
+    def remove_inventory_item(self, user_id: Union[int, str], item_name: str,
                              quantity: int = 1, rarity: str = None) -> bool:
         """Remove an item from user's inventory"""
-        user_id = str(user_id)
         try:
             # Build query based on whether rarity is specified
             if rarity:
@@ -448,276 +923,331 @@ class Database:
             else:
                 query = "SELECT id, quantity FROM inventory WHERE user_id = ? AND item_name = ?"
                 params = (user_id, item_name)
-            
-            self.cursor.execute(query, params)
-            existing_item = self.cursor.fetchone()
-            
-            if not existing_item:
-                return False  # Item not found
-            
-            if existing_item['quantity'] <= quantity:
-                # Remove the item entirely
-                self.cursor.execute("DELETE FROM inventory WHERE id = ?", (existing_item['id'],))
-            else:
-                # Reduce quantity
-                new_quantity = existing_item['quantity'] - quantity
-                self.cursor.execute(
-                    "UPDATE inventory SET quantity = ? WHERE id = ?",
-                    (new_quantity, existing_item['id'])
-                )
-            
-            self.conn.commit()
+
+            # Lock spans the read-modify-write so two threads can't both
+            # read the same quantity and double-spend it
+            with self._write_lock:
+                existing_item = self.conn.execute(query, params).fetchone()
+
+                if not existing_item:
+                    return False  # Item not found
+
+                if existing_item['quantity'] <= quantity:
+                    # Remove the item entirely
+                    self.conn.execute("DELETE FROM inventory WHERE id = ?", (existing_item['id'],))
+                else:
+                    # Reduce quantity
+                    new_quantity = existing_item['quantity'] - quantity
+                    self.conn.execute(
+                        "UPDATE inventory SET quantity = ? WHERE id = ?",
+                        (new_quantity, existing_item['id'])
+                    )
+
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error removing inventory item for user {user_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error removing inventory item for user %s: %s", user_id, e)
             return False
     
     # Jobs methods
     def get_jobs(self) -> Dict[str, List[int]]:
         """Get all available jobs"""
         try:
-            self.cursor.execute("SELECT * FROM jobs")
-            jobs = self.cursor.fetchall()
+            with self._read_cursor() as cur:
+                cur.execute("SELECT * FROM jobs")
+                jobs = cur.fetchall()
             return {job['job_name']: [job['min_pay'], job['max_pay']] for job in jobs}
         except sqlite3.Error as e:
-            logger.error(f"Error getting jobs: {e}")
+            logger.error("Error getting jobs: %s", e)
             return {}
     
     def set_job(self, job_name: str, min_pay: int, max_pay: int) -> bool:
         """Set or update a job"""
         try:
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO jobs (job_name, min_pay, max_pay) VALUES (?, ?, ?)",
-                (job_name, min_pay, max_pay)
-            )
-            self.conn.commit()
+            with self._write_lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO jobs (job_name, min_pay, max_pay) VALUES (?, ?, ?)",
+                    (job_name, min_pay, max_pay)
+                )
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error setting job {job_name}: {e}")
-            self.conn.rollback()
+            logger.error("Error setting job %s: %s", job_name, e)
             return False
-    
+
+    def set_jobs(self, jobs: Dict[str, tuple]) -> bool:
+        """Set many jobs in one transaction.
+
+        Maps job_name to a (min_pay, max_pay) pair - one prepared
+        statement and one fsync for the whole definitions file.
+        """
+        if not jobs:
+            return True
+
+        try:
+            rows = [(job_name, pay[0], pay[1]) for job_name, pay in jobs.items()]
+            with self.transaction():
+                self._executemany_chunked(
+                    "INSERT OR REPLACE INTO jobs (job_name, min_pay, max_pay) VALUES (?, ?, ?)",
+                    rows
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error bulk-setting jobs: %s", e)
+            return False
+
+
     def get_user_job(self, user_id: Union[int, str], job_name: str) -> Dict[str, Any]:
         """Get user's job data"""
-        user_id = str(user_id)
         try:
-            self.cursor.execute(
-                "SELECT * FROM user_jobs WHERE user_id = ? AND job_name = ?",
-                (user_id, job_name)
-            )
-            job = self.cursor.fetchone()
+            with self._read_cursor() as cur:
+                cur.execute(
+                    "SELECT * FROM user_jobs WHERE user_id = ? AND job_name = ?",
+                    (user_id, job_name)
+                )
+                job = cur.fetchone()
             
             if job:
                 return dict(job)
             return {"user_id": user_id, "job_name": job_name, "xp": 0, "rank": "apprentice", "last_work": None}
         except sqlite3.Error as e:
-            logger.error(f"Error getting job for user {user_id}: {e}")
+            logger.error("Error getting job for user %s: %s", user_id, e)
             return {"user_id": user_id, "job_name": job_name, "xp": 0, "rank": "apprentice", "last_work": None}
     
+    # Columns that callers are allowed to write through update_user_job
+    USER_JOB_FIELDS = ("xp", "rank", "last_work")
+
     def update_user_job(self, user_id: Union[int, str], job_name: str, data: Dict[str, Any]) -> bool:
         """Update user's job data"""
-        user_id = str(user_id)
         try:
-            # Ensure user exists
-            self.get_user(user_id)
-            
-            # Check if job record exists
-            self.cursor.execute(
-                "SELECT 1 FROM user_jobs WHERE user_id = ? AND job_name = ?",
-                (user_id, job_name)
-            )
-            exists = self.cursor.fetchone()
-            
-            if exists:
-                # Update existing record
-                fields = []
-                values = []
-                for key, value in data.items():
-                    if key not in ['user_id', 'job_name']:
-                        fields.append(f"{key} = ?")
-                        values.append(value)
-                
-                if not fields:
-                    return True  # Nothing to update
-                
-                query = f"UPDATE user_jobs SET {', '.join(fields)} WHERE user_id = ? AND job_name = ?"
-                values.extend([user_id, job_name])
-                
-                self.cursor.execute(query, values)
-            else:
-                # Create new record
-                data.setdefault('xp', 0)
-                data.setdefault('rank', 'apprentice')
-                
-                fields = ['user_id', 'job_name'] + list(data.keys())
-                placeholders = ['?'] * len(fields)
-                values = [user_id, job_name] + list(data.values())
-                
-                query = f"INSERT INTO user_jobs ({', '.join(fields)}) VALUES ({', '.join(placeholders)})"
-                self.cursor.execute(query, values)
-            
-            self.conn.commit()
+            fields = tuple(field for field in self.USER_JOB_FIELDS if field in data)
+
+            if not fields:
+                return True  # Nothing to update
+
+            # Single atomic UPSERT against the (user_id, job_name) primary
+            # key - the table defaults cover xp/rank on first insert
+            key = ('user_jobs', fields)
+            query = self._update_sql_cache.get(key)
+            if query is None:
+                columns = ', '.join(fields)
+                placeholders = ', '.join('?' * len(fields))
+                updates = ', '.join(f"{field} = excluded.{field}" for field in fields)
+                query = (f"INSERT INTO user_jobs (user_id, job_name, {columns}) "
+                         f"VALUES (?, ?, {placeholders}) "
+                         f"ON CONFLICT(user_id, job_name) DO UPDATE SET {updates}")
+                self._update_sql_cache[key] = query
+
+            with self.transaction():
+                self._ensure_user(user_id)
+                self.conn.execute(query, [user_id, job_name] + [data[field] for field in fields])
+
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating job for user {user_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error updating job for user %s: %s", user_id, e)
             return False
     
     # Sect methods
     def get_sect(self, sect_id: str) -> Dict[str, Any]:
         """Get sect data"""
         try:
-            self.cursor.execute("SELECT * FROM sects WHERE sect_id = ?", (sect_id,))
-            sect = self.cursor.fetchone()
+            with self._read_cursor() as cur:
+                cur.execute("SELECT * FROM sects WHERE sect_id = ?", (sect_id,))
+                sect = cur.fetchone()
             
             if sect:
                 return dict(sect)
             return None
         except sqlite3.Error as e:
-            logger.error(f"Error getting sect {sect_id}: {e}")
+            logger.error("Error getting sect %s: %s", sect_id, e)
             return None
     
     def create_sect(self, sect_id: str, name: str, leader_id: Union[int, str], 
                    description: str = '', level: int = 1, wealth: int = 0) -> bool:
         """Create a new sect"""
-        leader_id = str(leader_id)
         try:
-            # Ensure leader exists
-            self.get_user(leader_id)
-            
-            self.cursor.execute(
-                "INSERT INTO sects (sect_id, name, leader_id, description, level, wealth) VALUES (?, ?, ?, ?, ?, ?)",
-                (sect_id, name, leader_id, description, level, wealth)
-            )
-            
-            # Add leader as member with 'leader' role
-            self.cursor.execute(
-                "INSERT INTO sect_members (sect_id, user_id, role) VALUES (?, ?, 'leader')",
-                (sect_id, leader_id)
-            )
-            
-            self.conn.commit()
+            with self.transaction():
+                self._ensure_user(leader_id)
+
+                self.conn.execute(
+                    "INSERT INTO sects (sect_id, name, leader_id, description, level, wealth) VALUES (?, ?, ?, ?, ?, ?)",
+                    (sect_id, name, leader_id, description, level, wealth)
+                )
+
+                # Add leader as member with 'leader' role
+                self.conn.execute(
+                    "INSERT INTO sect_members (sect_id, user_id, role) VALUES (?, ?, 'leader')",
+                    (sect_id, leader_id)
+                )
+
+            self._sect_members_cache.pop(sect_id, None)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error creating sect {name}: {e}")
-            self.conn.rollback()
+            logger.error("Error creating sect %s: %s", name, e)
             return False
     
+    # Columns that callers are allowed to write through update_sect
+    SECT_FIELDS = ("name", "leader_id", "description", "level", "wealth", "max_members")
+
+    def _sect_exists(self, sect_id: str) -> bool:
+        """Single-column existence probe - no full sect row fetch"""
+        with self._write_lock:
+            cur = self.conn.execute("SELECT 1 FROM sects WHERE sect_id = ?", (sect_id,))
+            return cur.fetchone() is not None
+
     def update_sect(self, sect_id: str, data: Dict[str, Any]) -> bool:
         """Update sect data"""
         try:
             # Check if sect exists
-            if not self.get_sect(sect_id):
+            if not self._sect_exists(sect_id):
                 return False
-            
-            # Build the update query
-            fields = []
-            values = []
-            for key, value in data.items():
-                if key != 'sect_id':
-                    fields.append(f"{key} = ?")
-                    values.append(value)
-            
+
+            fields = tuple(field for field in self.SECT_FIELDS if field in data)
+
             if not fields:
                 return True  # Nothing to update
-            
-            query = f"UPDATE sects SET {', '.join(fields)} WHERE sect_id = ?"
-            values.append(sect_id)
-            
-            self.cursor.execute(query, values)
-            self.conn.commit()
+
+            key = ('sects', fields)
+            query = self._update_sql_cache.get(key)
+            if query is None:
+                updates = ', '.join(f"{field} = ?" for field in fields)
+                query = f"UPDATE sects SET {updates} WHERE sect_id = ?"
+                self._update_sql_cache[key] = query
+
+            with self._write_lock:
+                self.conn.execute(query, [data[field] for field in fields] + [sect_id])
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating sect {sect_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error updating sect %s: %s", sect_id, e)
             return False
     
-    def get_sect_members(self, sect_id: str) -> List[Dict[str, Any]]:
-        """Get all members of a sect"""
+    def get_sect_members(self, sect_id: str) -> List[sqlite3.Row]:
+        """Get all members of a sect (cached for a short TTL).
+
+        Rows support mapping access (member['user_id']) without the cost
+        of materializing a dict per row.
+        """
+        cached = self._sect_members_cache.get(sect_id)
+        if cached is not None and time.monotonic() - cached[0] < self.SECT_MEMBERS_CACHE_TTL:
+            return cached[1]
+
         try:
-            self.cursor.execute(
-                """SELECT sm.*, u.cash, u.bank 
-                   FROM sect_members sm 
-                   JOIN users u ON sm.user_id = u.user_id 
-                   WHERE sm.sect_id = ?""",
-                (sect_id,)
-            )
-            members = self.cursor.fetchall()
-            return [dict(member) for member in members]
+            with self._read_cursor() as cur:
+                cur.execute(
+                    """SELECT sm.user_id, sm.role, sm.joined_at,
+                              COALESCE(b.cash, 0) AS cash, COALESCE(b.bank, 0) AS bank
+                       FROM sect_members sm
+                       LEFT JOIN user_balances b ON sm.user_id = b.user_id
+                       WHERE sm.sect_id = ?""",
+                    (sect_id,)
+                )
+                members = cur.fetchall()
+            self._sect_members_cache[sect_id] = (time.monotonic(), members)
+            return members
         except sqlite3.Error as e:
-            logger.error(f"Error getting members for sect {sect_id}: {e}")
+            logger.error("Error getting members for sect %s: %s", sect_id, e)
             return []
     
     def add_sect_member(self, sect_id: str, user_id: Union[int, str], role: str = 'member') -> bool:
         """Add a user to a sect"""
-        user_id = str(user_id)
         try:
-            # Ensure user exists
-            self.get_user(user_id)
-            
             # Check if sect exists
-            if not self.get_sect(sect_id):
+            if not self._sect_exists(sect_id):
                 return False
-            
-            # Add member
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO sect_members (sect_id, user_id, role) VALUES (?, ?, ?)",
-                (sect_id, user_id, role)
-            )
-            
-            self.conn.commit()
+
+            with self.transaction():
+                self._ensure_user(user_id)
+
+                # Add member
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sect_members (sect_id, user_id, role) VALUES (?, ?, ?)",
+                    (sect_id, user_id, role)
+                )
+
+            self._sect_members_cache.pop(sect_id, None)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error adding member {user_id} to sect {sect_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error adding member %s to sect %s: %s", user_id, sect_id, e)
             return False
-    
+
+    def add_sect_members(self, sect_id: str, members: List[tuple]) -> bool:
+        """Add many users to a sect in one transaction.
+
+        Each entry is (user_id, role); role may be omitted. The sect
+        existence probe runs once, not per member.
+        """
+        if not members:
+            return True
+
+        try:
+            if not self._sect_exists(sect_id):
+                return False
+
+            rows = []
+            user_rows = []
+            for member in members:
+                user_id = member[0]
+                role = member[1] if len(member) > 1 else 'member'
+                rows.append((sect_id, user_id, role))
+                user_rows.append((user_id,))
+
+            with self.transaction():
+                self._executemany_chunked(_SQL_ENSURE_USER, user_rows)
+                self._executemany_chunked(
+                    "INSERT OR REPLACE INTO sect_members (sect_id, user_id, role) VALUES (?, ?, ?)",
+                    rows
+                )
+
+            self._sect_members_cache.pop(sect_id, None)
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error bulk-adding members to sect %s: %s", sect_id, e)
+            return False
+
     def remove_sect_member(self, sect_id: str, user_id: Union[int, str]) -> bool:
         """Remove a user from a sect"""
-        user_id = str(user_id)
         try:
-            self.cursor.execute(
-                "DELETE FROM sect_members WHERE sect_id = ? AND user_id = ?",
-                (sect_id, user_id)
-            )
-            
-            self.conn.commit()
+            with self._write_lock:
+                self.conn.execute(
+                    "DELETE FROM sect_members WHERE sect_id = ? AND user_id = ?",
+                    (sect_id, user_id)
+                )
+
+            self._sect_members_cache.pop(sect_id, None)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error removing member {user_id} from sect {sect_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error removing member %s from sect %s: %s", user_id, sect_id, e)
             return False
     
     # Store methods
     def get_store_items(self) -> Dict[str, Dict[str, Any]]:
         """Get all store items"""
         try:
-            self.cursor.execute("SELECT * FROM store_items")
-            items = self.cursor.fetchall()
+            with self._read_cursor() as cur:
+                cur.execute("SELECT * FROM store_items")
+                items = cur.fetchall()
             return {item['item_name']: dict(item) for item in items}
         except sqlite3.Error as e:
-            logger.error(f"Error getting store items: {e}")
+            logger.error("Error getting store items: %s", e)
             return {}
     
     def get_store_item(self, item_name: str) -> Dict[str, Any]:
         """Get a specific store item"""
         try:
-            self.cursor.execute("SELECT * FROM store_items WHERE item_name = ?", (item_name,))
-            item = self.cursor.fetchone()
+            with self._read_cursor() as cur:
+                cur.execute("SELECT * FROM store_items WHERE item_name = ?", (item_name,))
+                item = cur.fetchone()
             
             if item:
                 result = dict(item)
                 # Parse metadata JSON
                 if 'metadata' in result:
                     try:
-                        result['metadata'] = json.loads(result['metadata'])
-                    except json.JSONDecodeError:
+                        result['metadata'] = _parse_json(result['metadata'])
+                    except ValueError:
                         result['metadata'] = {}
                 return result
             return None
         except sqlite3.Error as e:
-            logger.error(f"Error getting store item {item_name}: {e}")
+            logger.error("Error getting store item %s: %s", item_name, e)
             return None
     
     def set_store_item(self, item_name: str, price: int, description: str = '', 
@@ -728,180 +1258,310 @@ class Database:
             metadata = {}
         
         try:
-            self.cursor.execute(
-                """INSERT OR REPLACE INTO store_items 
-                   (item_name, price, description, stock, min_rank, rarity, metadata) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (item_name, price, description, stock, min_rank, rarity, json.dumps(metadata))
-            )
-            
-            self.conn.commit()
+            with self._write_lock:
+                self.conn.execute(
+                    """INSERT OR REPLACE INTO store_items
+                       (item_name, price, description, stock, min_rank, rarity, metadata)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    (item_name, price, description, stock, min_rank, rarity, _dump_json(metadata))
+                )
+
+            _parse_json.cache_clear()
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error setting store item {item_name}: {e}")
-            self.conn.rollback()
+            logger.error("Error setting store item %s: %s", item_name, e)
+            return False
+
+    def set_store_items(self, items: List[tuple]) -> bool:
+        """Set many store items in one transaction.
+
+        Each entry is (item_name, price, description, stock, min_rank,
+        rarity, metadata); everything after price may be omitted. One
+        executemany and one fsync for the whole catalog.
+        """
+        if not items:
+            return True
+
+        try:
+            rows = []
+            for item in items:
+                item_name, price = item[0], item[1]
+                description = item[2] if len(item) > 2 else ''
+                stock = item[3] if len(item) > 3 else -1
+                min_rank = item[4] if len(item) > 4 else 0
+                rarity = item[5] if len(item) > 5 else 'common'
+                metadata = item[6] if len(item) > 6 and item[6] else {}
+                rows.append((item_name, price, description, stock, min_rank,
+                             rarity, _dump_json(metadata)))
+
+            with self.transaction():
+                self._executemany_chunked(
+                    """INSERT OR REPLACE INTO store_items
+                       (item_name, price, description, stock, min_rank, rarity, metadata)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    rows
+                )
+
+            _parse_json.cache_clear()
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error bulk-setting store items: %s", e)
             return False
     
     def update_store_item_stock(self, item_name: str, change: int) -> bool:
         """Update a store item's stock"""
         try:
-            item = self.get_store_item(item_name)
-            if not item:
-                return False
-            
-            # Only update if stock is not unlimited (-1)
-            if item['stock'] != -1:
-                new_stock = max(0, item['stock'] + change)
-                self.cursor.execute(
-                    "UPDATE store_items SET stock = ? WHERE item_name = ?",
-                    (new_stock, item_name)
-                )
-                self.conn.commit()
-            
+            # Lock spans the read-modify-write so concurrent purchases
+            # can't both observe the same stock level
+            with self._write_lock:
+                item = self.get_store_item(item_name)
+                if not item:
+                    return False
+
+                # Only update if stock is not unlimited (-1)
+                if item['stock'] != -1:
+                    new_stock = max(0, item['stock'] + change)
+                    self.conn.execute(
+                        "UPDATE store_items SET stock = ? WHERE item_name = ?",
+                        (new_stock, item_name)
+                    )
+
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating stock for item {item_name}: {e}")
-            self.conn.rollback()
+            logger.error("Error updating stock for item %s: %s", item_name, e)
             return False
     
     # Tournament methods
     def get_tournament(self, tournament_id: str) -> Dict[str, Any]:
         """Get tournament data"""
         try:
-            self.cursor.execute("SELECT * FROM tournaments WHERE tournament_id = ?", (tournament_id,))
-            tournament = self.cursor.fetchone()
+            with self._read_cursor() as cur:
+                cur.execute("SELECT * FROM tournaments WHERE tournament_id = ?", (tournament_id,))
+                tournament = cur.fetchone()
             
             if tournament:
                 result = dict(tournament)
-                # Parse reward_data JSON
-                if 'reward_data' in result:
+                # The JSON converter already decoded reward_data on
+                # current schemas; databases predating the JSON decltype
+                # still hand back a string
+                if isinstance(result.get('reward_data'), (str, bytes)):
                     try:
-                        result['reward_data'] = json.loads(result['reward_data'])
-                    except json.JSONDecodeError:
+                        result['reward_data'] = _parse_json(result['reward_data'])
+                    except ValueError:
                         result['reward_data'] = {}
                 return result
             return None
         except sqlite3.Error as e:
-            logger.error(f"Error getting tournament {tournament_id}: {e}")
+            logger.error("Error getting tournament %s: %s", tournament_id, e)
             return None
     
     def create_tournament(self, tournament_id: str, host_id: Union[int, str], 
                          title: str, description: str = '', 
                          reward_data: Dict[str, Any] = None) -> bool:
         """Create a new tournament"""
-        host_id = str(host_id)
         if reward_data is None:
             reward_data = {}
         
         try:
-            # Ensure host exists
-            self.get_user(host_id)
-            
-            self.cursor.execute(
-                """INSERT INTO tournaments 
-                   (tournament_id, host_id, title, description, status, reward_data) 
-                   VALUES (?, ?, ?, ?, 'recruiting', ?)""",
-                (tournament_id, host_id, title, description, json.dumps(reward_data))
-            )
-            
-            self.conn.commit()
+            with self.transaction():
+                self._ensure_user(host_id)
+
+                self.conn.execute(
+                    """INSERT INTO tournaments
+                       (tournament_id, host_id, title, description, status, reward_data)
+                       VALUES (?, ?, ?, ?, 'recruiting', ?)""",
+                    (tournament_id, host_id, title, description, _dump_json(reward_data))
+                )
+
+            # A fresh row invalidates any no-op-skip signature cached
+            # for a previous tournament under the same id
+            self._tournament_update_sig.pop(tournament_id, None)
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error creating tournament {title}: {e}")
-            self.conn.rollback()
+            logger.error("Error creating tournament %s: %s", title, e)
             return False
     
+    def _tournament_exists(self, tournament_id: str) -> bool:
+        """Single-column existence probe - no row fetch or JSON decode"""
+        with self._write_lock:
+            cur = self.conn.execute("SELECT 1 FROM tournaments WHERE tournament_id = ?",
+                                    (tournament_id,))
+            return cur.fetchone() is not None
+
+    def tournament_exists(self, tournament_id: str) -> bool:
+        """Check whether a tournament exists without fetching its row.
+
+        Callers that only need a bool should use this instead of
+        get_tournament, which decodes reward_data on every hit.
+        """
+        try:
+            return self._tournament_exists(tournament_id)
+        except sqlite3.Error as e:
+            logger.error("Error checking tournament %s: %s", tournament_id, e)
+            return False
+
     def update_tournament(self, tournament_id: str, data: Dict[str, Any]) -> bool:
         """Update tournament data"""
         try:
-            # Check if tournament exists
-            if not self.get_tournament(tournament_id):
-                return False
-            
             # Handle special case for reward_data
             if 'reward_data' in data and isinstance(data['reward_data'], dict):
-                data['reward_data'] = json.dumps(data['reward_data'])
-            
-            # Build the update query
-            fields = []
-            values = []
-            for key, value in data.items():
-                if key != 'tournament_id':
-                    fields.append(f"{key} = ?")
-                    values.append(value)
-            
+                data['reward_data'] = _dump_json(data['reward_data'])
+
+            # Sorted field-set key so equivalent updates share one cached
+            # statement (and one prepared plan inside SQLite)
+            fields = tuple(sorted(k for k in data if k != 'tournament_id'))
+
             if not fields:
-                return True  # Nothing to update
-            
-            query = f"UPDATE tournaments SET {', '.join(fields)} WHERE tournament_id = ?"
-            values.append(tournament_id)
-            
-            self.cursor.execute(query, values)
-            self.conn.commit()
+                # Nothing to update - still report whether the row exists
+                return self._tournament_exists(tournament_id)
+
+            key = ('tournaments', fields)
+            query = self._update_sql_cache.get(key)
+            if query is None:
+                updates = ', '.join(f"{field} = ?" for field in fields)
+                query = f"UPDATE tournaments SET {updates} WHERE tournament_id = ?"
+                self._update_sql_cache[key] = query
+
+            values = [data[field] for field in fields] + [tournament_id]
+
+            # Skip the UPDATE when it would rewrite the values the last
+            # call already set - repeated status pushes (migration,
+            # periodic refreshes) otherwise churn WAL pages for nothing
+            update_sig = hash((fields, tuple(repr(v) for v in values)))
+            if self._tournament_update_sig.get(tournament_id) == update_sig:
+                return True
+
+            # The rowcount tells us whether the tournament existed - no
+            # separate SELECT (and reward_data JSON decode) needed
+            with self._write_lock:
+                if self.conn.execute(query, values).rowcount == 0:
+                    return False
+
+            if len(self._tournament_update_sig) >= 1024:
+                self._tournament_update_sig.clear()
+            self._tournament_update_sig[tournament_id] = update_sig
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error updating tournament {tournament_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error updating tournament %s: %s", tournament_id, e)
             return False
     
-    def get_tournament_participants(self, tournament_id: str) -> List[Dict[str, Any]]:
-        """Get all participants of a tournament"""
+    def get_tournament_participants(self, tournament_id: str) -> List[sqlite3.Row]:
+        """Get all participants of a tournament.
+
+        Rows support mapping access (participant['participant_id'])
+        without the cost of materializing a dict per row.
+        """
         try:
-            self.cursor.execute(
-                "SELECT * FROM tournament_participants WHERE tournament_id = ?",
-                (tournament_id,)
-            )
-            participants = self.cursor.fetchall()
-            return [dict(participant) for participant in participants]
+            with self._read_cursor() as cur:
+                cur.execute(
+                    """SELECT participant_id, is_bot, bot_name, joined_at
+                       FROM tournament_participants WHERE tournament_id = ?""",
+                    (tournament_id,)
+                )
+                return cur.fetchall()
         except sqlite3.Error as e:
-            logger.error(f"Error getting participants for tournament {tournament_id}: {e}")
+            logger.error("Error getting participants for tournament %s: %s", tournament_id, e)
+            return []
+
+    def get_tournament_participant_ids(self, tournament_id: str) -> List[Union[int, str]]:
+        """Get just the participant IDs of a tournament.
+
+        Single-column fetch with no per-row Row/dict layer - for callers
+        that only check membership or count heads.
+        """
+        try:
+            with self._read_cursor() as cur:
+                cur.execute(
+                    "SELECT participant_id FROM tournament_participants WHERE tournament_id = ?",
+                    (tournament_id,)
+                )
+                return [row[0] for row in cur.fetchall()]
+        except sqlite3.Error as e:
+            logger.error("Error getting participant ids for tournament %s: %s", tournament_id, e)
             return []
     
     def add_tournament_participant(self, tournament_id: str, participant_id: Union[int, str], 
                                  is_bot: bool = False, bot_name: str = None) -> bool:
         """Add a participant to a tournament"""
-        participant_id = str(participant_id)
         try:
-            # Check if tournament exists
-            if not self.get_tournament(tournament_id):
-                return False
-            
-            # If not a bot, ensure user exists
+            # If not a bot, make sure a users row exists
             if not is_bot:
-                self.get_user(participant_id)
-            
-            self.cursor.execute(
-                """INSERT OR REPLACE INTO tournament_participants 
-                   (tournament_id, participant_id, is_bot, bot_name) 
-                   VALUES (?, ?, ?, ?)""",
-                (tournament_id, participant_id, 1 if is_bot else 0, bot_name)
-            )
-            
-            self.conn.commit()
-            return True
+                self._ensure_user(participant_id)
+
+            # The WHERE EXISTS guard folds the existence check into the
+            # INSERT itself; rowcount is 0 when the tournament is unknown.
+            # ON CONFLICT updates the existing row in place rather than
+            # the delete-and-reinsert that OR REPLACE performs.
+            with self._write_lock:
+                cur = self.conn.execute(
+                    """INSERT INTO tournament_participants
+                       (tournament_id, participant_id, is_bot, bot_name)
+                       SELECT ?, ?, ?, ?
+                       WHERE EXISTS (SELECT 1 FROM tournaments WHERE tournament_id = ?)
+                       ON CONFLICT(tournament_id, participant_id)
+                       DO UPDATE SET is_bot = excluded.is_bot, bot_name = excluded.bot_name""",
+                    (tournament_id, participant_id, 1 if is_bot else 0, bot_name, tournament_id)
+                )
+
+                return cur.rowcount > 0
         except sqlite3.Error as e:
-            logger.error(f"Error adding participant {participant_id} to tournament {tournament_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error adding participant %s to tournament %s: %s", participant_id, tournament_id, e)
             return False
     
+    def add_tournament_participants(self, tournament_id: str,
+                                    participants: List[tuple]) -> bool:
+        """Add many participants to a tournament in one transaction.
+
+        Each entry is (participant_id, is_bot, bot_name); is_bot and
+        bot_name may be omitted.
+        """
+        if not participants:
+            return True
+
+        try:
+            # Check if tournament exists (once, not per participant)
+            if not self._tournament_exists(tournament_id):
+                return False
+
+            rows = []
+            for participant in participants:
+                participant_id = participant[0]
+                is_bot = bool(participant[1]) if len(participant) > 1 else False
+                bot_name = participant[2] if len(participant) > 2 else None
+                rows.append((tournament_id, participant_id, 1 if is_bot else 0, bot_name))
+
+            with self.transaction():
+                self._executemany_chunked(
+                    """INSERT INTO tournament_participants
+                       (tournament_id, participant_id, is_bot, bot_name)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT(tournament_id, participant_id)
+                       DO UPDATE SET is_bot = excluded.is_bot, bot_name = excluded.bot_name""",
+                    rows
+                )
+            return True
+        except sqlite3.Error as e:
+            logger.error("Error bulk-adding participants to tournament %s: %s", tournament_id, e)
+            return False
+
     def remove_tournament_participant(self, tournament_id: str, participant_id: Union[int, str]) -> bool:
         """Remove a participant from a tournament"""
-        participant_id = str(participant_id)
         try:
-            self.cursor.execute(
-                "DELETE FROM tournament_participants WHERE tournament_id = ? AND participant_id = ?",
-                (tournament_id, participant_id)
-            )
-            
-            self.conn.commit()
+            with self._write_lock:
+                self.conn.execute(
+                    "DELETE FROM tournament_participants WHERE tournament_id = ? AND participant_id = ?",
+                    (tournament_id, participant_id)
+                )
+
             return True
         except sqlite3.Error as e:
-            logger.error(f"Error removing participant {participant_id} from tournament {tournament_id}: {e}")
-            self.conn.rollback()
+            logger.error("Error removing participant %s from tournament %s: %s", participant_id, tournament_id, e)
             return False
 
-# Create a global database instance
+# Create a global database instance. Closing at interpreter exit lets a
+# clean shutdown checkpoint the WAL file back into the main database.
 db = Database()
+atexit.register(db.close)
 
 # Migration helpers
 def migrate_json_to_db():
@@ -912,40 +1572,56 @@ def migrate_json_to_db():
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     DATA_DIR = os.path.join(BASE_DIR, "data")
     
-    # Helper to load JSON files
+    # Helper to load JSON files. Reading bytes lets orjson parse the
+    # buffer directly, skipping the Python-level UTF-8 decode - the
+    # economy file can be MB-scale, where the parser choice matters.
     def load_json_file(path):
         path = Path(path)
         if not path.exists():
             return {}
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if _orjson is not None:
+                return _orjson.loads(data)
+            return json.loads(data)
+        except ValueError:
             return {}
-    
+
+    # Stream (key, value) pairs from a top-level JSON object. With ijson
+    # installed, memory stays O(1) in the number of users and parsing
+    # overlaps the DB writes; otherwise the file is loaded whole.
+    def iter_json_top(path):
+        if _ijson is not None:
+            if not Path(path).exists():
+                return
+            with open(path, 'rb') as f:
+                yield from _ijson.kvitems(f, '')
+        else:
+            yield from load_json_file(path).items()
+
     # Migrate economy data
     def migrate_economy():
         logger.info("Migrating economy data...")
         economy_path = os.path.join(DATA_DIR, "economy.json")
-        economy_data = load_json_file(economy_path)
-        
-        for user_id, data in economy_data.items():
-            # Create or update user
-            user_data = {
-                "cash": data.get("cash", 0),
-                "bank": data.get("bank", 0),
-                "job": data.get("job"),
-                "last_cultivate": data.get("last_cultivate"),
-                "last_collect": data.get("last_collect"),
-                "message_count": data.get("message_count", 0)
-            }
-            db.update_user(user_id, user_data)
+
+        for user_id, data in iter_json_top(economy_path):
+            # Create or update user. Only fields present in the source
+            # are written - sparse records shouldn't SET absent columns
+            # back to their defaults (null-over-null still costs a WAL
+            # page write).
+            user_data = {field: data[field] for field in Database.USER_FIELDS
+                         if field in data}
+            if user_data:
+                db.update_user(user_id, user_data)
+            else:
+                db._ensure_user(user_id)
             
-            # Migrate inventory
+            # Migrate inventory (one executemany per user, not one
+            # commit per item)
             if "inventory" in data and isinstance(data["inventory"], list):
-                for item in data["inventory"]:
-                    if isinstance(item, str):
-                        db.add_inventory_item(user_id, item)
+                items = [(item,) for item in data["inventory"] if isinstance(item, str)]
+                db.add_inventory_items(user_id, items)
             
             # Migrate jobs data
             if "jobs" in data and isinstance(data["jobs"], dict):
@@ -962,26 +1638,22 @@ def migrate_json_to_db():
     def migrate_jobs():
         logger.info("Migrating jobs definitions...")
         jobs_path = os.path.join(DATA_DIR, "jobs.json")
-        jobs_data = load_json_file(jobs_path)
-        
-        for job_name, pay_range in jobs_data.items():
-            if isinstance(pay_range, list) and len(pay_range) >= 2:
-                db.set_job(job_name, pay_range[0], pay_range[1])
+        db.set_jobs({job_name: pay_range for job_name, pay_range in iter_json_top(jobs_path)
+                     if isinstance(pay_range, list) and len(pay_range) >= 2})
     
     # Migrate store items
     def migrate_store():
         logger.info("Migrating store items...")
         store_path = os.path.join(DATA_DIR, "store.json")
-        store_data = load_json_file(store_path)
-        
-        for item_name, item_data in store_data.items():
+        rows = []
+        for item_name, item_data in iter_json_top(store_path):
             if isinstance(item_data, dict):
                 metadata = {}
                 for key, value in item_data.items():
                     if key not in ["price", "description", "stock", "min_rank", "rarity"]:
                         metadata[key] = value
-                
-                db.set_store_item(
+
+                rows.append((
                     item_name,
                     item_data.get("price", 0),
                     item_data.get("description", ""),
@@ -989,15 +1661,14 @@ def migrate_json_to_db():
                     item_data.get("min_rank", 0),
                     item_data.get("rarity", "common"),
                     metadata
-                )
+                ))
+        db.set_store_items(rows)
     
     # Migrate sects
     def migrate_sects():
         logger.info("Migrating sects data...")
         sects_path = os.path.join(DATA_DIR, "sects.json")
-        sects_data = load_json_file(sects_path)
-        
-        for sect_id, sect_data in sects_data.items():
+        for sect_id, sect_data in iter_json_top(sects_path):
             if isinstance(sect_data, dict):
                 # Create sect
                 db.create_sect(
@@ -1009,19 +1680,17 @@ def migrate_json_to_db():
                     sect_data.get("wealth", 0)
                 )
                 
-                # Add members
+                # Add members in one batch (leader already added)
                 if "members" in sect_data and isinstance(sect_data["members"], list):
-                    for member_id in sect_data["members"]:
-                        if member_id != sect_data.get("leader"):  # Leader already added
-                            db.add_sect_member(sect_id, member_id)
+                    members = [(member_id,) for member_id in sect_data["members"]
+                               if member_id != sect_data.get("leader")]
+                    db.add_sect_members(sect_id, members)
     
     # Migrate tournaments
     def migrate_tournaments():
         logger.info("Migrating tournaments data...")
         tournaments_path = os.path.join(DATA_DIR, "tournaments.json")
-        tournaments_data = load_json_file(tournaments_path)
-        
-        for tournament_id, tournament_data in tournaments_data.items():
+        for tournament_id, tournament_data in iter_json_top(tournaments_path):
             if isinstance(tournament_data, dict):
                 # Extract reward data
                 reward_data = {}
@@ -1038,32 +1707,55 @@ def migrate_json_to_db():
                     reward_data
                 )
                 
-                # Update status and winner
-                update_data = {"status": tournament_data.get("status", "recruiting")}
+                # Update status and winner, only when the source has them
+                # (create_tournament already set status to 'recruiting')
+                update_data = {}
+                if "status" in tournament_data:
+                    update_data["status"] = tournament_data["status"]
                 if "winner" in tournament_data:
                     update_data["winner_id"] = tournament_data["winner"]
-                db.update_tournament(tournament_id, update_data)
+                if update_data:
+                    db.update_tournament(tournament_id, update_data)
                 
-                # Add participants
+                # Add participants in one batch. Entries are normally
+                # bare ids (bots as negative ints), but some snapshots
+                # store full participant row dicts - unwrap those so the
+                # bulk insert only ever binds scalars.
                 if "participants" in tournament_data and isinstance(tournament_data["participants"], list):
-                    for participant_id in tournament_data["participants"]:
-                        is_bot = isinstance(participant_id, int) and participant_id < 0
-                        bot_name = None
-                        if is_bot and "bot_names" in tournament_data:
-                            bot_name = tournament_data["bot_names"].get(str(participant_id))
-                        db.add_tournament_participant(tournament_id, participant_id, is_bot, bot_name)
+                    bot_names = tournament_data.get("bot_names", {})
+                    rows = []
+                    for entry in tournament_data["participants"]:
+                        if isinstance(entry, dict):
+                            pid = entry.get("participant_id")
+                            if pid is None:
+                                continue
+                            try:
+                                pid = int(pid)
+                            except (TypeError, ValueError):
+                                pass
+                            rows.append((pid, bool(entry.get("is_bot")),
+                                         entry.get("bot_name")))
+                        else:
+                            is_bot = isinstance(entry, int) and entry < 0
+                            rows.append((entry, is_bot,
+                                         bot_names.get(str(entry)) if is_bot else None))
+                    db.add_tournament_participants(tournament_id, rows)
     
-    # Run migrations
+    # Run migrations inside one transaction: every helper called below
+    # joins it instead of committing on its own, so the whole run costs a
+    # single fsync - and a failure rolls back cleanly. Jobs definitions go
+    # first because user_jobs rows reference them.
     try:
-        migrate_economy()
-        migrate_jobs()
-        migrate_store()
-        migrate_sects()
-        migrate_tournaments()
+        with db.transaction():
+            migrate_jobs()
+            migrate_economy()
+            migrate_store()
+            migrate_sects()
+            migrate_tournaments()
         logger.info("Migration completed successfully!")
         return True
     except Exception as e:
-        logger.error(f"Migration failed: {e}")
+        logger.error("Migration failed: %s", e)
         return False
 
 if __name__ == "__main__":
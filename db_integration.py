@@ -1,17 +1,50 @@
 # -*- coding: utf-8 -*-
 import os
+import copy
 import json
+import time
+import atexit
+import asyncio
 import logging
+from collections import defaultdict
 from typing import Dict, Any, List, Union, Optional, Tuple
 from database import db
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# orjson parses and dumps a few times faster than stdlib json; fall back
+# quietly, same as database.py
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# brotli shrinks JSON snapshots several-fold for archival copies; like
+# orjson it is optional - without it a ".br" path is read/written as
+# plain bytes
+try:
+    import brotli as _brotli
+except ImportError:
+    _brotli = None
+
+# Handler/level config belongs to the entrypoint; this module only logs
 logger = logging.getLogger('db_integration')
 
+def setup_logging(level: int = logging.INFO) -> None:
+    """Configure root logging for script-style entrypoints.
+
+    Importing this module does no logging setup - call this once from
+    the program entrypoint to get the bot's usual format.
+    """
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
 # Constants
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Reward fields that live inside tournaments.reward_data
+_REWARD_KEYS = ("add_money", "set_money", "rem_money", "reward_title")
+
 # File paths (for backward compatibility)
 DATA_FILE = "economy.json"
 INCOME_FILE = "user_money.json"
@@ -21,45 +54,74 @@ SECTS_FILE = "sects.json"
 TOURNAMENTS_FILE = "tournaments.json"
 
 # Helper functions to replace the original file operations
+def _loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON bytes with orjson when available"""
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize to JSON bytes with orjson when available"""
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        return _orjson.dumps(data, option=option)
+    return json.dumps(data, indent=4 if indent else None).encode('utf-8')
+
+def _to_int(value: Any, default: int = 0) -> int:
+    """Coerce a value to int, with a no-op fast path for the common case"""
+    if isinstance(value, int):
+        return value
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+def _read_bytes(file_path: str) -> bytes:
+    """Read a file, transparently decompressing ".br" snapshots"""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if file_path.endswith('.br') and _brotli is not None:
+        raw = _brotli.decompress(raw)
+    return raw
+
+def _write_bytes(file_path: str, payload: bytes) -> None:
+    """Write a file, transparently compressing ".br" snapshots"""
+    if file_path.endswith('.br') and _brotli is not None:
+        # quality 5 keeps compression near-instant for snapshot-sized
+        # payloads while still shrinking JSON several-fold
+        payload = _brotli.compress(payload, quality=5)
+    with open(file_path, 'wb') as f:
+        f.write(payload)
+
 def ensure_file(file_path: str, default_content: Any = None) -> None:
     """Ensure a file exists with default content (for backward compatibility)"""
     if not os.path.exists(file_path):
-        with open(file_path, 'w', encoding='utf-8') as f:
-            if default_content is None:
-                json.dump({}, f)
-            else:
-                json.dump(default_content, f)
+        _write_bytes(file_path, _dumps(default_content if default_content is not None else {}))
 
 def load_json(file_path: str, default: Any = None) -> Dict:
     """Load JSON data from file or database based on file path"""
     if default is None:
         default = {}
-    
-    # Use database for specific files
-    if os.path.basename(file_path) == DATA_FILE:
-        # For economy.json, we'll construct the data from the database
-        return get_economy_data()
-    elif os.path.basename(file_path) == JOBS_FILE:
-        # For jobs.json, get jobs from database
-        return db.get_jobs()
-    elif os.path.basename(file_path) == STORE_FILE:
-        # For store.json, get store items from database
-        return db.get_store_items()
-    elif os.path.basename(file_path) == SECTS_FILE:
-        # For sects.json, get sects from database
-        return get_sects_data()
-    elif os.path.basename(file_path) == TOURNAMENTS_FILE:
-        # For tournaments.json, get tournaments from database
-        return get_tournaments_data()
-    
-    # For other files, use the original file-based approach
+
+    # Use database for specific files - one dict probe instead of a
+    # basename comparison per branch
+    handler = _LOADERS.get(os.path.basename(file_path))
+    if handler is not None:
+        return handler()
+
+    # For other files, use the original file-based approach. Open
+    # directly and create on FileNotFoundError rather than stat-ing
+    # first - the happy path costs one syscall instead of two.
     try:
-        if not os.path.exists(file_path):
-            ensure_file(file_path, default)
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
+        return _loads(_read_bytes(file_path))
+    except FileNotFoundError:
+        ensure_file(file_path, default)
+        return default
+    except ValueError:
         # If the file is empty or invalid JSON, return the default
         if file_path.endswith(JOBS_FILE):
             # Special case for jobs.json
@@ -68,441 +130,788 @@ def load_json(file_path: str, default: Any = None) -> Dict:
 
 def save_json(file_path: str, data: Dict) -> None:
     """Save JSON data to file or database based on file path"""
-    # Use database for specific files
-    if os.path.basename(file_path) == DATA_FILE:
-        # For economy.json, update the database
-        save_economy_data(data)
-        return
-    elif os.path.basename(file_path) == JOBS_FILE:
-        # For jobs.json, update jobs in database
-        save_jobs_data(data)
-        return
-    elif os.path.basename(file_path) == STORE_FILE:
-        # For store.json, update store items in database
-        save_store_data(data)
-        return
-    elif os.path.basename(file_path) == SECTS_FILE:
-        # For sects.json, update sects in database
-        save_sects_data(data)
+    # Use database for specific files - one dict probe instead of a
+    # basename comparison per branch
+    handler = _SAVERS.get(os.path.basename(file_path))
+    if handler is not None:
+        handler(data)
         return
-    elif os.path.basename(file_path) == TOURNAMENTS_FILE:
-        # For tournaments.json, update tournaments in database
-        save_tournaments_data(data)
-        return
-    
+
     # For other files, use the original file-based approach
+    if _orjson is not None or file_path.endswith('.br'):
+        _write_bytes(file_path, _dumps(data, indent=True))
+        return
+    # Stdlib fallback: stream json.dump straight into a buffered file
+    # object instead of materializing the whole document as one string
+    # first - roughly halves peak memory on large snapshots
     with open(file_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4)
 
+async def async_load_json(file_path: str, default: Any = None) -> Dict:
+    """load_json run in a worker thread so it never blocks the event loop"""
+    return await asyncio.to_thread(load_json, file_path, default)
+
+async def async_save_json(file_path: str, data: Dict) -> None:
+    """save_json run in a worker thread so it never blocks the event loop"""
+    await asyncio.to_thread(save_json, file_path, data)
+
+class BufferedJSONStore:
+    """Load a JSON table once and write it back only if marked dirty.
+
+    Usage:
+        with BufferedJSONStore(STORE_FILE) as store:
+            store.data[item]["stock"] -= 1
+            store.mark_dirty()
+
+    A read-modify-write that used to cost a load plus an unconditional
+    save now costs one load and at most one save; read-only passes skip
+    the write entirely. Nothing is written if the block raises.
+    """
+
+    def __init__(self, file_path: str, default: Any = None):
+        self.file_path = file_path
+        self.default = default
+        self.data: Any = None
+        self._dirty = False
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+
+    def __enter__(self) -> "BufferedJSONStore":
+        self.data = load_json(self.file_path, self.default)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._dirty and exc_type is None:
+            save_json(self.file_path, self.data)
+        return False
+
 # Database integration functions
+def iter_economy_data():
+    """Yield (user_id, entry) pairs for every user, lazily.
+
+    The small side tables (inventory, last_collects meta) are grouped up
+    front - they have to be fully read to group by owner anyway - but
+    the wide users scan streams one row at a time, so consumers that
+    stop early or write entries out as they go never hold the whole
+    snapshot in memory.
+    """
+    # Three whole-table scans instead of three queries per user - the
+    # per-query round trip dominates once there are more than a handful
+    # of users
+    cursor = db.conn.cursor()
+    inv_by_user = defaultdict(list)
+    cursor.execute("SELECT user_id, item_name FROM inventory")
+    for row in cursor.fetchall():
+        inv_by_user[row['user_id']].append(row['item_name'])
+
+    collects_by_user = {}
+    cursor.execute("SELECT user_id, meta_value FROM user_meta WHERE meta_key = 'last_collects'")
+    for row in cursor.fetchall():
+        try:
+            collects_by_user[row['user_id']] = _loads(row['meta_value'])
+        except ValueError:
+            pass
+
+    cursor.execute(
+        """SELECT u.user_id, COALESCE(b.cash, u.cash, 0) AS cash,
+                  COALESCE(b.bank, u.bank, 0) AS bank,
+                  u.job, u.last_cultivate, u.last_collect, u.message_count
+           FROM users u
+           LEFT JOIN user_balances b ON b.user_id = u.user_id"""
+    )
+    for row in cursor:
+        user_id = row['user_id']
+
+        # Format user data as expected by the bot; cash and bank are
+        # always present and always integers
+        user_entry = {
+            "cash": _to_int(row['cash']),
+            "bank": _to_int(row['bank']),
+            "balance": 0,  # Will be calculated by the bot
+            "last_collect": row['last_collect'],
+            "job": row['job'],
+            "last_cultivate": row['last_cultivate'],
+            "last_job": None,
+            "inventory": inv_by_user.get(user_id, []),
+            "message_count": row['message_count'] or 0
+        }
+
+        # Get user metadata
+        last_collects = collects_by_user.get(user_id)
+        if last_collects:
+            user_entry["last_collects"] = last_collects
+
+        yield user_id, user_entry
+
 def get_economy_data() -> Dict[str, Dict[str, Any]]:
     """Get economy data from database in the format expected by the bot"""
-    result = {}
-    
-    # Get all users from the database
     try:
-        # We'll need to query all users
-        # Since we don't have a direct method to get all users, we'll construct this manually
-        conn = db.conn
-        cursor = conn.cursor()
-        cursor.execute("SELECT user_id FROM users")
-        user_ids = [row['user_id'] for row in cursor.fetchall()]
-        
-        for user_id in user_ids:
-            user_data = db.get_user(user_id)
-            inventory = db.get_inventory(user_id)
-            
-            # Ensure cash and bank are always present and are integers
-            cash = user_data.get("cash")
-            if cash is None:
-                cash = 0
-            else:
-                try:
-                    cash = int(cash)
-                except (ValueError, TypeError):
-                    cash = 0
-                    
-            bank = user_data.get("bank")
-            if bank is None:
-                bank = 0
-            else:
-                try:
-                    bank = int(bank)
-                except (ValueError, TypeError):
-                    bank = 0
-            
-            # Format user data as expected by the bot
-            user_entry = {
-                "cash": cash,
-                "bank": bank,
-                "balance": 0,  # Will be calculated by the bot
-                "last_collect": user_data.get("last_collect"),
-                "job": user_data.get("job"),
-                "last_cultivate": user_data.get("last_cultivate"),
-                "last_job": user_data.get("last_job"),
-                "inventory": [item["item_name"] for item in inventory],
-                "message_count": user_data.get("message_count", 0)
-            }
-            
-            # Get user metadata
-            last_collects = db.get_user_meta(user_id, "last_collects")
-            if last_collects:
-                user_entry["last_collects"] = last_collects
-            
-            # Add to result
-            result[user_id] = user_entry
-        
-        return result
+        return dict(iter_economy_data())
     except Exception as e:
-        logger.error(f"Error getting economy data: {e}")
+        logger.error("Error getting economy data: %s", e)
         return {}
 
+def get_economy_data_columnar() -> Dict[str, Dict[Any, Any]]:
+    """Get the economy snapshot as one dict per column instead of one
+    dict per user.
+
+    Aggregate consumers (totals, leaderboards) only touch one or two
+    fields; handing them `{"cash": {uid: n}, ...}` lets them run
+    `sum(columns["cash"].values())` or sort a single dict at C speed
+    instead of pulling a per-user dict apart for every row.
+    """
+    columns: Dict[str, Dict[Any, Any]] = {
+        "cash": {}, "bank": {}, "message_count": {}, "inventory": {}
+    }
+    try:
+        cursor = db.conn.cursor()
+        cursor.execute(
+            """SELECT u.user_id, COALESCE(b.cash, u.cash, 0) AS cash,
+                      COALESCE(b.bank, u.bank, 0) AS bank, u.message_count
+               FROM users u
+               LEFT JOIN user_balances b ON b.user_id = u.user_id"""
+        )
+        cash_col = columns["cash"]
+        bank_col = columns["bank"]
+        count_col = columns["message_count"]
+        for row in cursor.fetchall():
+            user_id = row['user_id']
+            cash_col[user_id] = _to_int(row['cash'])
+            bank_col[user_id] = _to_int(row['bank'])
+            count_col[user_id] = row['message_count'] or 0
+
+        inv_col = columns["inventory"]
+        cursor.execute("SELECT user_id, item_name FROM inventory")
+        for row in cursor.fetchall():
+            inv_col.setdefault(row['user_id'], []).append(row['item_name'])
+
+        return columns
+    except Exception as e:
+        logger.error("Error getting columnar economy data: %s", e)
+        return columns
+
 def save_economy_data(data: Dict[str, Dict[str, Any]]) -> None:
     """Save economy data to database"""
     try:
-        for user_id, user_data in data.items():
-            # Ensure cash and bank are always present and are integers
-            cash = user_data.get("cash")
-            if cash is None:
-                cash = 0
-            else:
-                try:
-                    cash = int(cash)
-                except (ValueError, TypeError):
-                    cash = 0
-                    
-            bank = user_data.get("bank")
-            if bank is None:
-                bank = 0
-            else:
-                try:
-                    bank = int(bank)
-                except (ValueError, TypeError):
-                    bank = 0
-            
-            # Update user data
-            db_user_data = {
-                "cash": cash,
-                "bank": bank,
-                "job": user_data.get("job"),
-                "last_cultivate": user_data.get("last_cultivate"),
-                "last_collect": user_data.get("last_collect"),
-                "message_count": user_data.get("message_count", 0)
-            }
-            db.update_user(user_id, db_user_data)
-            
-            # Update inventory
-            if "inventory" in user_data and isinstance(user_data["inventory"], list):
-                # First, get current inventory
-                current_inventory = db.get_inventory(user_id)
-                current_items = {item["item_name"]: item for item in current_inventory}
-                
-                # Add new items and remove missing items
-                for item_name in user_data["inventory"]:
-                    if item_name not in current_items:
-                        db.add_inventory_item(user_id, item_name)
-                
-                for item in current_inventory:
-                    if item["item_name"] not in user_data["inventory"]:
-                        db.remove_inventory_item(user_id, item["item_name"])
-            
-            # Update last_collects metadata
-            if "last_collects" in user_data:
-                db.set_user_meta(user_id, "last_collects", user_data["last_collects"])
+        # One transaction for the whole snapshot - the nested update_user /
+        # inventory / meta calls join it instead of committing per row
+        with db.transaction():
+            sigs = _save_economy_rows(data)
+        # Only mark rows clean once the transaction has committed
+        _row_sigs.update(sigs)
+        # Bulk writes bypass the per-key invalidation in the helpers below
+        _meta_cache.clear()
+        _balance_cache.clear()
     except Exception as e:
-        logger.error(f"Error saving economy data: {e}")
+        logger.error("Error saving economy data: %s", e)
+
+# Last-written signature per user row. Steady-state snapshot saves carry
+# mostly unchanged rows; matching a signature means the UPDATE can be
+# skipped entirely. Flushed wholesale past the cap to stay bounded.
+_ROW_SIGS_MAX = 16384
+_row_sigs: Dict[Any, tuple] = {}
+
+def _save_economy_rows(data: Dict[str, Dict[str, Any]]) -> Dict[Any, tuple]:
+    """Write every user row in the snapshot; caller owns the transaction.
+
+    Returns the signatures of the rows written so the caller can mark
+    them clean after the transaction commits.
+    """
+    # Shape all the user rows first and hand them to the bulk path - one
+    # executemany per column group instead of an update_user call per user
+    updates = {}
+    sigs: Dict[Any, tuple] = {}
+    for user_id, user_data in data.items():
+        # Bind .get once per row - the loop body is pure dict probes
+        get = user_data.get
+        sig = (_to_int(get("cash")), _to_int(get("bank")), get("job"),
+               get("last_cultivate"), get("last_collect"), get("message_count", 0))
+        if _row_sigs.get(user_id) == sig:
+            continue
+        sigs[user_id] = sig
+        updates[user_id] = {
+            "cash": sig[0],
+            "bank": sig[1],
+            "job": sig[2],
+            "last_cultivate": sig[3],
+            "last_collect": sig[4],
+            "message_count": sig[5]
+        }
+    if len(_row_sigs) + len(sigs) > _ROW_SIGS_MAX:
+        _row_sigs.clear()
+    if updates and not db.bulk_update_users(updates):
+        sigs.clear()
+
+    for user_id, user_data in data.items():
+        # Update inventory - diff as sets and skip the DB entirely when
+        # nothing changed, which is the common case for most users
+        if "inventory" in user_data and isinstance(user_data["inventory"], list):
+            current_items = {item["item_name"] for item in db.get_inventory(user_id)}
+            wanted_items = set(user_data["inventory"])
+            if wanted_items != current_items:
+                for item_name in wanted_items - current_items:
+                    db.add_inventory_item(user_id, item_name)
+                for item_name in current_items - wanted_items:
+                    db.remove_inventory_item(user_id, item_name)
+
+        # Update last_collects metadata
+        if "last_collects" in user_data:
+            db.set_user_meta(user_id, "last_collects", user_data["last_collects"])
+
+    return sigs
 
 def save_jobs_data(data: Dict[str, List[int]]) -> None:
     """Save jobs data to database"""
     try:
-        for job_name, pay_range in data.items():
-            if isinstance(pay_range, list) and len(pay_range) >= 2:
-                db.set_job(job_name, pay_range[0], pay_range[1])
+        with db.transaction():
+            for job_name, pay_range in data.items():
+                if isinstance(pay_range, list) and len(pay_range) >= 2:
+                    db.set_job(job_name, pay_range[0], pay_range[1])
+    except Exception as e:
+        logger.error("Error saving jobs data: %s", e)
+
+def save_store_data(data: Dict[str, Dict[str, Any]]) -> None:
+    """Save store data to database"""
+    try:
+        rows = []
+        for item_name, item_data in data.items():
+            if not isinstance(item_data, dict):
+                continue
+            # Rows that came out of get_store_items carry item_name and
+            # the stored metadata JSON verbatim - fold those back in
+            # rather than wrapping them as new metadata, so saving a
+            # loaded catalog is a no-op instead of nesting a layer per
+            # round trip
+            metadata = item_data.get("metadata") or {}
+            if isinstance(metadata, (str, bytes)):
+                try:
+                    metadata = _loads(metadata)
+                except ValueError:
+                    metadata = {}
+            if not isinstance(metadata, dict):
+                metadata = {}
+            extras = {k: v for k, v in item_data.items()
+                      if k not in ("item_name", "metadata", "price", "description",
+                                   "stock", "min_rank", "rarity")}
+            if extras:
+                metadata = {**metadata, **extras}
+            rows.append((
+                item_name,
+                item_data.get("price", 0),
+                item_data.get("description", ""),
+                item_data.get("stock", -1),
+                item_data.get("min_rank", 0),
+                item_data.get("rarity", "common"),
+                metadata
+            ))
+        db.set_store_items(rows)
     except Exception as e:
-        logger.error(f"Error saving jobs data: {e}")
+        logger.error("Error saving store data: %s", e)
 
 def get_sects_data() -> Dict[str, Dict[str, Any]]:
     """Get sects data from database in the format expected by the bot"""
     result = {}
     
     try:
-        # Get all sects
+        # Two whole-table scans instead of two queries per sect
         conn = db.conn
         cursor = conn.cursor()
-        cursor.execute("SELECT sect_id FROM sects")
-        sect_ids = [row['sect_id'] for row in cursor.fetchall()]
-        
-        for sect_id in sect_ids:
-            sect_data = db.get_sect(sect_id)
-            members = db.get_sect_members(sect_id)
-            
+        cursor.execute("SELECT sect_id, name, leader_id, description, level, wealth FROM sects")
+        sect_rows = cursor.fetchall()
+
+        members_by_sect = defaultdict(list)
+        cursor.execute("SELECT sect_id, user_id FROM sect_members")
+        for row in cursor.fetchall():
+            members_by_sect[row['sect_id']].append(row['user_id'])
+
+        for row in sect_rows:
+            sect_id = row['sect_id']
+
             # Format sect data as expected by the bot
             sect_entry = {
-                "name": sect_data.get("name", f"Sect {sect_id}"),
-                "leader": sect_data.get("leader_id"),
-                "description": sect_data.get("description", ""),
-                "level": sect_data.get("level", 1),
-                "wealth": sect_data.get("wealth", 0),
-                "members": [member["user_id"] for member in members]
+                "name": row['name'] or f"Sect {sect_id}",
+                "leader": row['leader_id'],
+                "description": row['description'] or "",
+                "level": row['level'] if row['level'] is not None else 1,
+                "wealth": row['wealth'] or 0,
+                "members": members_by_sect.get(sect_id, [])
             }
-            
+
             # Add to result
             result[sect_id] = sect_entry
-        
+
         return result
     except Exception as e:
-        logger.error(f"Error getting sects data: {e}")
+        logger.error("Error getting sects data: %s", e)
         return {}
 
 def save_sects_data(data: Dict[str, Dict[str, Any]]) -> None:
     """Save sects data to database"""
     try:
-        # Get existing sects
-        conn = db.conn
-        cursor = conn.cursor()
-        cursor.execute("SELECT sect_id FROM sects")
-        existing_sects = {row['sect_id'] for row in cursor.fetchall()}
-        
-        for sect_id, sect_data in data.items():
-            if sect_id in existing_sects:
-                # Update existing sect
-                update_data = {
-                    "name": sect_data.get("name", f"Sect {sect_id}"),
-                    "leader_id": sect_data.get("leader"),
-                    "description": sect_data.get("description", ""),
-                    "level": sect_data.get("level", 1),
-                    "wealth": sect_data.get("wealth", 0)
-                }
-                db.update_sect(sect_id, update_data)
-                
-                # Update members
-                if "members" in sect_data and isinstance(sect_data["members"], list):
-                    # Get current members
-                    current_members = db.get_sect_members(sect_id)
-                    current_member_ids = {member["user_id"] for member in current_members}
-                    
-                    # Add new members
-                    for member_id in sect_data["members"]:
-                        if member_id not in current_member_ids:
-                            role = "leader" if member_id == sect_data.get("leader") else "member"
+        # One transaction for the whole snapshot - nested db.* calls join
+        # it, and the deletes commit together with the updates
+        with db.transaction():
+            cursor = db.conn.cursor()
+            cursor.execute("SELECT sect_id FROM sects")
+            existing_sects = {row['sect_id'] for row in cursor.fetchall()}
+
+            for sect_id, sect_data in data.items():
+                # Bind .get once per row - the loop body is pure dict probes
+                get = sect_data.get
+                if sect_id in existing_sects:
+                    # Update existing sect
+                    update_data = {
+                        "name": get("name") or f"Sect {sect_id}",
+                        "leader_id": get("leader"),
+                        "description": get("description", ""),
+                        "level": get("level", 1),
+                        "wealth": get("wealth", 0)
+                    }
+                    db.update_sect(sect_id, update_data)
+
+                    # Update members
+                    if "members" in sect_data and isinstance(sect_data["members"], list):
+                        # Set diffs on both sides - O(n) instead of an O(n)
+                        # list scan per current member
+                        current_members = db.get_sect_members(sect_id)
+                        current_member_ids = {member["user_id"] for member in current_members}
+                        wanted_members = set(sect_data["members"])
+                        leader_id = get("leader")
+
+                        # Add new members
+                        for member_id in wanted_members - current_member_ids:
+                            role = "leader" if member_id == leader_id else "member"
                             db.add_sect_member(sect_id, member_id, role)
-                    
-                    # Remove missing members
-                    for member in current_members:
-                        if member["user_id"] not in sect_data["members"]:
-                            db.remove_sect_member(sect_id, member["user_id"])
-            else:
-                # Create new sect
-                db.create_sect(
-                    sect_id,
-                    sect_data.get("name", f"Sect {sect_id}"),
-                    sect_data.get("leader", "0"),
-                    sect_data.get("description", ""),
-                    sect_data.get("level", 1),
-                    sect_data.get("wealth", 0)
+
+                        # Remove missing members
+                        for member_id in current_member_ids - wanted_members:
+                            db.remove_sect_member(sect_id, member_id)
+                else:
+                    # Create new sect
+                    db.create_sect(
+                        sect_id,
+                        get("name") or f"Sect {sect_id}",
+                        get("leader", "0"),
+                        get("description", ""),
+                        get("level", 1),
+                        get("wealth", 0)
+                    )
+
+                    # Add members
+                    if "members" in sect_data and isinstance(sect_data["members"], list):
+                        leader_id = get("leader")
+                        for member_id in sect_data["members"]:
+                            if member_id != leader_id:  # Leader already added
+                                db.add_sect_member(sect_id, member_id)
+
+            # Remove deleted sects - one compiled statement, bound per id
+            to_delete = existing_sects - data.keys()
+            if to_delete:
+                db.conn.executemany(
+                    "DELETE FROM sects WHERE sect_id = ?",
+                    [(sect_id,) for sect_id in to_delete]
                 )
-                
-                # Add members
-                if "members" in sect_data and isinstance(sect_data["members"], list):
-                    for member_id in sect_data["members"]:
-                        if member_id != sect_data.get("leader"):  # Leader already added
-                            db.add_sect_member(sect_id, member_id)
-        
-        # Remove deleted sects
-        for sect_id in existing_sects:
-            if sect_id not in data:
-                cursor.execute("DELETE FROM sects WHERE sect_id = ?", (sect_id,))
-        
-        db.conn.commit()
+                # Drop cached rosters with the rows, mirroring the
+                # tournament-signature handling below - otherwise
+                # get_sect_members serves the dead sect for up to the
+                # cache TTL
+                for sect_id in to_delete:
+                    db._sect_members_cache.pop(sect_id, None)
     except Exception as e:
-        logger.error(f"Error saving sects data: {e}")
-        db.conn.rollback()
+        logger.error("Error saving sects data: %s", e)
 
 def get_tournaments_data() -> Dict[str, Dict[str, Any]]:
     """Get tournaments data from database in the format expected by the bot"""
     result = {}
     
     try:
-        # Get all tournaments
+        # Two whole-table scans instead of two queries per tournament
         conn = db.conn
         cursor = conn.cursor()
-        cursor.execute("SELECT tournament_id FROM tournaments")
-        tournament_ids = [row['tournament_id'] for row in cursor.fetchall()]
-        
-        for tournament_id in tournament_ids:
-            tournament_data = db.get_tournament(tournament_id)
-            participants = db.get_tournament_participants(tournament_id)
-            
+        cursor.execute(
+            """SELECT tournament_id, host_id, title, description, status,
+                      winner_id, reward_data
+               FROM tournaments"""
+        )
+        tournament_rows = cursor.fetchall()
+
+        participants_by_tid = defaultdict(list)
+        cursor.execute(
+            "SELECT tournament_id, participant_id, is_bot, bot_name FROM tournament_participants"
+        )
+        for row in cursor.fetchall():
+            participants_by_tid[row['tournament_id']].append(row)
+
+        for row in tournament_rows:
+            tournament_id = row['tournament_id']
+
             # Format tournament data as expected by the bot
             tournament_entry = {
-                "title": tournament_data.get("title", f"Tournament {tournament_id}"),
-                "host": tournament_data.get("host_id"),
-                "description": tournament_data.get("description", ""),
-                "status": tournament_data.get("status", "recruiting"),
+                "title": row['title'] or f"Tournament {tournament_id}",
+                "host": row['host_id'],
+                "description": row['description'] or "",
+                "status": row['status'] or "recruiting",
                 "participants": []
             }
-            
+
             # Add winner if exists
-            if tournament_data.get("winner_id"):
-                tournament_entry["winner"] = tournament_data["winner_id"]
-            
-            # Add reward data if exists
-            reward_data = tournament_data.get("reward_data", {})
-            for key in ["add_money", "set_money", "rem_money", "reward_title"]:
+            if row['winner_id']:
+                tournament_entry["winner"] = row['winner_id']
+
+            # Add reward data if exists - the JSON converter already
+            # decoded reward_data on fetch; older databases may still
+            # hand back a string
+            reward_data = row['reward_data'] or {}
+            if isinstance(reward_data, (str, bytes)):
+                try:
+                    reward_data = _loads(reward_data)
+                except ValueError:
+                    reward_data = {}
+            for key in _REWARD_KEYS:
                 if key in reward_data:
                     tournament_entry[key] = reward_data[key]
-            
+
             # Add participants
             bot_names = {}
-            for participant in participants:
+            for participant in participants_by_tid.get(tournament_id, ()):
                 participant_id = participant["participant_id"]
                 # Convert to int for bot IDs (negative numbers)
                 if participant["is_bot"] and participant["bot_name"]:
-                    bot_names[participant_id] = participant["bot_name"]
+                    # Keyed by str to match the JSON-shaped contract the
+                    # savers expect - they look names up via str(pid)
+                    bot_names[str(participant_id)] = participant["bot_name"]
                     # Convert to int for bots
                     try:
                         participant_id = int(participant_id)
                     except ValueError:
                         pass
-                
+
                 tournament_entry["participants"].append(participant_id)
-            
+
             # Add bot names if any
             if bot_names:
                 tournament_entry["bot_names"] = bot_names
-            
+
             # Add to result
             result[tournament_id] = tournament_entry
-        
+
         return result
     except Exception as e:
-        logger.error(f"Error getting tournaments data: {e}")
+        logger.error("Error getting tournaments data: %s", e)
         return {}
 
 def save_tournaments_data(data: Dict[str, Dict[str, Any]]) -> None:
     """Save tournaments data to database"""
     try:
-        # Get existing tournaments
-        conn = db.conn
-        cursor = conn.cursor()
-        cursor.execute("SELECT tournament_id FROM tournaments")
-        existing_tournaments = {row['tournament_id'] for row in cursor.fetchall()}
-        
-        for tournament_id, tournament_data in data.items():
-            # Extract reward data
-            reward_data = {}
-            for key in ["add_money", "set_money", "rem_money", "reward_title"]:
-                if key in tournament_data:
-                    reward_data[key] = tournament_data[key]
+        # One transaction for the whole snapshot - nested db.* calls join
+        # it, and the deletes commit together with the updates
+        with db.transaction():
+            cursor = db.conn.cursor()
+            cursor.execute("SELECT tournament_id FROM tournaments")
+            existing_tournaments = {row['tournament_id'] for row in cursor.fetchall()}
+
+            for tournament_id, tournament_data in data.items():
+                # Bind .get once per row - the loop body is pure dict probes
+                get = tournament_data.get
+                # Extract reward data
+                reward_data = {key: tournament_data[key]
+                               for key in _REWARD_KEYS if key in tournament_data}
             
-            if tournament_id in existing_tournaments:
-                # Update existing tournament
-                update_data = {
-                    "title": tournament_data.get("title", f"Tournament {tournament_id}"),
-                    "host_id": tournament_data.get("host"),
-                    "description": tournament_data.get("description", ""),
-                    "status": tournament_data.get("status", "recruiting"),
-                    "reward_data": reward_data
-                }
+                if tournament_id in existing_tournaments:
+                    # Update existing tournament
+                    update_data = {
+                        "title": get("title") or f"Tournament {tournament_id}",
+                        "host_id": get("host"),
+                        "description": get("description", ""),
+                        "status": get("status", "recruiting"),
+                        "reward_data": reward_data
+                    }
                 
-                # Add winner if exists
-                if "winner" in tournament_data:
-                    update_data["winner_id"] = tournament_data["winner"]
+                    # Add winner if exists
+                    if "winner" in tournament_data:
+                        update_data["winner_id"] = tournament_data["winner"]
                 
-                db.update_tournament(tournament_id, update_data)
+                    db.update_tournament(tournament_id, update_data)
                 
-                # Update participants
-                if "participants" in tournament_data and isinstance(tournament_data["participants"], list):
-                    # Get current participants
-                    current_participants = db.get_tournament_participants(tournament_id)
-                    current_participant_ids = {p["participant_id"] for p in current_participants}
-                    
-                    # Process participants
-                    for participant_id in tournament_data["participants"]:
-                        # Handle bot participants (negative IDs)
-                        is_bot = isinstance(participant_id, int) and participant_id < 0
-                        p_id_str = str(participant_id)
-                        
-                        bot_name = None
-                        if is_bot and "bot_names" in tournament_data:
-                            bot_name = tournament_data["bot_names"].get(p_id_str)
-                        
-                        if p_id_str not in current_participant_ids:
-                            db.add_tournament_participant(tournament_id, p_id_str, is_bot, bot_name)
-                    
-                    # Remove missing participants
-                    for participant in current_participants:
-                        p_id = participant["participant_id"]
-                        if p_id not in [str(p) for p in tournament_data["participants"]]:
-                            db.remove_tournament_participant(tournament_id, p_id)
-            else:
-                # Create new tournament
-                db.create_tournament(
-                    tournament_id,
-                    tournament_data.get("host", "0"),
-                    tournament_data.get("title", f"Tournament {tournament_id}"),
-                    tournament_data.get("description", ""),
-                    reward_data
-                )
+                    # Update participants
+                    if "participants" in tournament_data and isinstance(tournament_data["participants"], list):
+                        # Get current participants. Compare both sides as
+                        # strings - the table stores integer ids while the
+                        # snapshot can carry either - and probe sets instead
+                        # of rebuilding a list per current participant.
+                        current_participants = db.get_tournament_participants(tournament_id)
+                        current_participant_ids = {str(p["participant_id"]) for p in current_participants}
+                        # Stringify the wanted list once; map(str, ...) runs
+                        # the conversion in C and feeds both the add loop
+                        # and the removal set
+                        parts = tournament_data["participants"]
+                        p_strs = list(map(str, parts))
+                        wanted_ids = set(p_strs)
+                        bot_names = get("bot_names") or {}
+
+                        # Process participants
+                        for participant_id, p_id_str in zip(parts, p_strs):
+                            # Handle bot participants (negative IDs)
+                            is_bot = isinstance(participant_id, int) and participant_id < 0
+                            bot_name = bot_names.get(p_id_str) if is_bot else None
+
+                            if p_id_str not in current_participant_ids:
+                                db.add_tournament_participant(tournament_id, participant_id, is_bot, bot_name)
+
+                        # Remove missing participants
+                        for participant in current_participants:
+                            p_id = participant["participant_id"]
+                            if str(p_id) not in wanted_ids:
+                                db.remove_tournament_participant(tournament_id, p_id)
+                else:
+                    # Create new tournament
+                    db.create_tournament(
+                        tournament_id,
+                        get("host", "0"),
+                        get("title") or f"Tournament {tournament_id}",
+                        get("description", ""),
+                        reward_data
+                    )
                 
-                # Update status and winner
-                update_data = {"status": tournament_data.get("status", "recruiting")}
-                if "winner" in tournament_data:
-                    update_data["winner_id"] = tournament_data["winner"]
-                db.update_tournament(tournament_id, update_data)
+                    # Update status and winner
+                    update_data = {"status": get("status", "recruiting")}
+                    if "winner" in tournament_data:
+                        update_data["winner_id"] = tournament_data["winner"]
+                    db.update_tournament(tournament_id, update_data)
                 
-                # Add participants
-                if "participants" in tournament_data and isinstance(tournament_data["participants"], list):
-                    for participant_id in tournament_data["participants"]:
-                        is_bot = isinstance(participant_id, int) and participant_id < 0
-                        p_id_str = str(participant_id)
-                        
-                        bot_name = None
-                        if is_bot and "bot_names" in tournament_data:
-                            bot_name = tournament_data["bot_names"].get(p_id_str)
-                        
-                        db.add_tournament_participant(tournament_id, p_id_str, is_bot, bot_name)
-        
-        # Remove deleted tournaments
-        for tournament_id in existing_tournaments:
-            if tournament_id not in data:
-                cursor.execute("DELETE FROM tournaments WHERE tournament_id = ?", (tournament_id,))
+                    # Add participants
+                    if "participants" in tournament_data and isinstance(tournament_data["participants"], list):
+                        parts = tournament_data["participants"]
+                        bot_names = get("bot_names") or {}
+                        for participant_id, p_id_str in zip(parts, map(str, parts)):
+                            is_bot = isinstance(participant_id, int) and participant_id < 0
+                            bot_name = bot_names.get(p_id_str) if is_bot else None
+                            db.add_tournament_participant(tournament_id, participant_id, is_bot, bot_name)
         
-        db.conn.commit()
+            # Remove deleted tournaments - one compiled statement, bound per id
+            to_delete = existing_tournaments - data.keys()
+            if to_delete:
+                db.conn.executemany(
+                    "DELETE FROM tournaments WHERE tournament_id = ?",
+                    [(tournament_id,) for tournament_id in to_delete]
+                )
+                # Drop the no-op-skip signatures with the rows, so a
+                # later recreate under the same id can't skip an update
+                # against values the old row held
+                for tournament_id in to_delete:
+                    db._tournament_update_sig.pop(tournament_id, None)
     except Exception as e:
-        logger.error(f"Error saving tournaments data: {e}")
-        db.conn.rollback()
+        logger.error("Error saving tournaments data: %s", e)
+
+# Dispatch tables for the JSON-compat shims, keyed by basename. Defined
+# after the handlers they reference; load_json/save_json look names up
+# here at call time.
+_LOADERS = {
+    DATA_FILE: get_economy_data,
+    JOBS_FILE: db.get_jobs,
+    STORE_FILE: db.get_store_items,
+    SECTS_FILE: get_sects_data,
+    TOURNAMENTS_FILE: get_tournaments_data,
+}
+_SAVERS = {
+    DATA_FILE: save_economy_data,
+    JOBS_FILE: save_jobs_data,
+    STORE_FILE: save_store_data,
+    SECTS_FILE: save_sects_data,
+    TOURNAMENTS_FILE: save_tournaments_data,
+}
 
 # Economy helper functions
+#
+# Short-lived read caches - the command handlers call these shims many
+# times per event, usually for rows that haven't changed. Same
+# monotonic-TTL shape as Database's sect-members cache; every write
+# helper below drops the key it touched.
+_READ_CACHE_TTL = 5
+_READ_CACHE_MAX = 4096
+_meta_cache: Dict[Tuple[Any, str], Tuple[float, Any]] = {}
+_balance_cache: Dict[Any, Tuple[float, Tuple[int, int]]] = {}
+
+def _drop_balance(user_id: Any) -> None:
+    _balance_cache.pop(user_id, None)
+
+# Write-behind balance buffer (opt-in). When enabled, add_money and
+# add_bank accumulate deltas in memory instead of committing per call;
+# flush_balances() applies everything in one transaction, so a burst of
+# small rewards costs one commit instead of dozens. get_balance overlays
+# the pending deltas so reads stay read-your-writes, and set_money /
+# set_bank discard the user's pending delta since an absolute write
+# supersedes it. An atexit hook drains the buffer on clean shutdown.
+_defer_writes = False
+_pending_cash: Dict[Any, int] = {}
+_pending_bank: Dict[Any, int] = {}
+
+def _bal_key(user_id: Any) -> Any:
+    # Pending deltas are keyed by int to match the INTEGER user_id
+    # column, whatever type the caller passed
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        return user_id
+
+def _coerce_amount(amount: Any, user_id: Any) -> int:
+    # Same boundary validation as db.add_cash/add_bank, so buffered and
+    # unbuffered modes accept the same inputs
+    try:
+        return int(amount)
+    except (ValueError, TypeError):
+        logger.warning("Invalid amount %s for user %s, using 0", amount, user_id)
+        return 0
+
+def defer_balance_writes(enabled: bool = True) -> None:
+    """Toggle the write-behind buffer; disabling flushes pending deltas"""
+    global _defer_writes
+    _defer_writes = enabled
+    if not enabled:
+        flush_balances()
+
+def flush_balances() -> bool:
+    """Apply all buffered cash/bank deltas in a single transaction.
+
+    On any failure the whole transaction rolls back and the deltas are
+    merged back into the buffer, so buffered money survives for the
+    next flush instead of vanishing.
+    """
+    if not _pending_cash and not _pending_bank:
+        return True
+    cash, bank = dict(_pending_cash), dict(_pending_bank)
+    _pending_cash.clear()
+    _pending_bank.clear()
+    try:
+        with db.transaction():
+            for user_id, amount in cash.items():
+                if not db.add_cash(user_id, amount):
+                    # add_cash logs and returns False on sqlite errors -
+                    # surface that as a failure so the transaction rolls
+                    # back instead of silently dropping this user's delta
+                    raise RuntimeError(f"add_cash failed for user {user_id}")
+            for user_id, amount in bank.items():
+                if not db.add_bank(user_id, amount):
+                    raise RuntimeError(f"add_bank failed for user {user_id}")
+        return True
+    except Exception as e:
+        logger.error("Error flushing buffered balances: %s", e)
+        # Deltas commute, so merging back on top of anything buffered
+        # since the snapshot loses nothing
+        for user_id, amount in cash.items():
+            _pending_cash[user_id] = _pending_cash.get(user_id, 0) + amount
+        for user_id, amount in bank.items():
+            _pending_bank[user_id] = _pending_bank.get(user_id, 0) + amount
+        return False
+
+atexit.register(flush_balances)
+
 def get_user_meta(user_id: Union[int, str], key: str, default: Any = None) -> Any:
     """Get user metadata from database"""
-    result = db.get_user_meta(user_id, key)
+    cached = _meta_cache.get((user_id, key))
+    if cached is not None and time.monotonic() - cached[0] < _READ_CACHE_TTL:
+        result = cached[1]
+    else:
+        result = db.get_user_meta(user_id, key)
+        if len(_meta_cache) >= _READ_CACHE_MAX:
+            _meta_cache.clear()
+        _meta_cache[(user_id, key)] = (time.monotonic(), result)
+    if isinstance(result, (dict, list)):
+        # Private copy per caller - same boundary rule as the database
+        # layer's parse cache, so a get -> mutate -> set loop can't leak
+        # its in-flight edits to other readers through the cache entry
+        result = copy.deepcopy(result)
     return result if result is not None else default
 
 def set_user_meta(user_id: Union[int, str], key: str, value: Any) -> None:
     """Set user metadata in database"""
     db.set_user_meta(user_id, key, value)
+    # Write through rather than invalidate: get -> mutate -> set loops
+    # re-read the same key right away, and the value just written is
+    # what a fresh fetch would parse back out of the JSON column. Cache
+    # a snapshot, not the caller's live object - later mutations of the
+    # caller's copy must not bleed into what other readers get.
+    if isinstance(value, (dict, list)):
+        value = copy.deepcopy(value)
+    if len(_meta_cache) >= _READ_CACHE_MAX:
+        _meta_cache.clear()
+    _meta_cache[(user_id, key)] = (time.monotonic(), value)
 
 def get_balance(user_id: Union[int, str]) -> Tuple[int, int]:
     """Get user's cash and bank balance"""
-    return db.get_balance(user_id)
+    cached = _balance_cache.get(user_id)
+    if cached is not None and time.monotonic() - cached[0] < _READ_CACHE_TTL:
+        return cached[1]
+    balance = db.get_balance(user_id)
+    if _pending_cash or _pending_bank:
+        key = _bal_key(user_id)
+        balance = (max(0, balance[0] + _pending_cash.get(key, 0)),
+                   max(0, balance[1] + _pending_bank.get(key, 0)))
+        return balance
+    if len(_balance_cache) >= _READ_CACHE_MAX:
+        _balance_cache.clear()
+    _balance_cache[user_id] = (time.monotonic(), balance)
+    return balance
 
 def add_money(user_id: Union[int, str], amount: int) -> bool:
     """Add money to user's cash balance"""
+    _drop_balance(user_id)
+    if _defer_writes:
+        key = _bal_key(user_id)
+        _pending_cash[key] = _pending_cash.get(key, 0) + _coerce_amount(amount, user_id)
+        return True
     return db.add_cash(user_id, amount)
 
 def set_money(user_id: Union[int, str], amount: int) -> bool:
     """Set user's cash balance"""
+    _drop_balance(user_id)
+    _pending_cash.pop(_bal_key(user_id), None)
     return db.set_cash(user_id, amount)
 
 def add_bank(user_id: Union[int, str], amount: int) -> bool:
     """Add money to user's bank balance"""
+    _drop_balance(user_id)
+    if _defer_writes:
+        key = _bal_key(user_id)
+        _pending_bank[key] = _pending_bank.get(key, 0) + _coerce_amount(amount, user_id)
+        return True
     return db.add_bank(user_id, amount)
 
 def set_bank(user_id: Union[int, str], amount: int) -> bool:
     """Set user's bank balance"""
+    _drop_balance(user_id)
+    _pending_bank.pop(_bal_key(user_id), None)
     return db.set_bank(user_id, amount)
 
+# Async variants of the hot helpers, bridged through db.run so command
+# handlers can await them without blocking the event loop on an fsync.
+# The process already holds one long-lived WAL connection plus the
+# read-only pool - opened once at import - so there is no per-call
+# connection setup for these to amortize; the executor hop is the whole
+# cost.
+async def async_get_user_meta(user_id: Union[int, str], key: str,
+                              default: Any = None) -> Any:
+    return await db.run(get_user_meta, user_id, key, default)
+
+async def async_set_user_meta(user_id: Union[int, str], key: str, value: Any) -> None:
+    await db.run(set_user_meta, user_id, key, value)
+
+async def async_get_balance(user_id: Union[int, str]) -> Tuple[int, int]:
+    return await db.run(get_balance, user_id)
+
+async def async_add_money(user_id: Union[int, str], amount: int) -> bool:
+    return await db.run(add_money, user_id, amount)
+
+async def async_set_money(user_id: Union[int, str], amount: int) -> bool:
+    return await db.run(set_money, user_id, amount)
+
+async def async_add_bank(user_id: Union[int, str], amount: int) -> bool:
+    return await db.run(add_bank, user_id, amount)
+
+async def async_set_bank(user_id: Union[int, str], amount: int) -> bool:
+    return await db.run(set_bank, user_id, amount)
+
 # Initialize database with default jobs if needed
 def init_default_jobs(default_jobs: Dict[str, List[int]]) -> None:
     """Initialize database with default jobs"""
@@ -521,18 +930,16 @@ def migrate_from_json() -> bool:
 # Function to check if migration is needed
 def check_migration_needed() -> bool:
     """Check if migration from JSON to database is needed"""
-    # Check if economy.json exists and has data
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if data:  # If there's data in the file
-                    # Check if database is empty
-                    conn = db.conn
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT COUNT(*) as count FROM users")
-                    count = cursor.fetchone()['count']
-                    return count == 0
-        except (json.JSONDecodeError, FileNotFoundError):
-            pass
-    return False
\ No newline at end of file
+    # Cheap probes only: an empty economy.json serializes to two bytes
+    # ({}), so the size check avoids parsing a potentially MB-scale file,
+    # and LIMIT 1 stops at the first user row instead of counting the
+    # whole table
+    try:
+        if os.path.getsize(DATA_FILE) <= 2:
+            return False
+    except OSError:
+        return False
+
+    cursor = db.conn.cursor()
+    cursor.execute("SELECT 1 FROM users LIMIT 1")
+    return cursor.fetchone() is None
\ No newline at end of file
@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 import discord
 import io
 import math
+import bisect
+import itertools
 try:
     from PIL import Image, ImageDraw, ImageOps, ImageFont  # type: ignore
     PILLOW_AVAILABLE = True
@@ -5177,15 +5179,22 @@ IMMORTAL_RARITY_WEIGHTS = [
     ("divine", 0.001),   # ALMOST IMPOSSIBLE
 ]
 
+# Cumulative-weight tables for _choose_weighted, keyed by the options
+# tuple - the rarity tables are module constants, so each is summed once
+# and every later roll is a binary search instead of a linear scan.
+_cum_weights_cache: Dict[tuple, Tuple[tuple, list]] = {}
+
 def _choose_weighted(options):
-    total = sum(w for _, w in options)
-    r = random.uniform(0, total)
-    upto = 0
-    for value, weight in options:
-        if upto + weight >= r:
-            return value
-        upto += weight
-    return options[0][0]
+    key = tuple(options)
+    cached = _cum_weights_cache.get(key)
+    if cached is None:
+        values = tuple(value for value, _ in key)
+        cum = list(itertools.accumulate(weight for _, weight in key))
+        cached = (values, cum)
+        _cum_weights_cache[key] = cached
+    values, cum = cached
+    r = random.uniform(0, cum[-1])
+    return values[min(bisect.bisect_left(cum, r), len(values) - 1)]
 
 
 def get_quality_variation(base_rarity: str) -> Tuple[str, bool]:
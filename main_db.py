@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 import os
+import sys
 import json
+import bisect
 import random
 import logging
 import asyncio
@@ -10,6 +12,7 @@ from dotenv import load_dotenv
 import discord
 from discord.ext import commands
 from discord import app_commands
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple
 import time
 
@@ -17,11 +20,13 @@ import time
 import database
 from db_integration import (
     # File operations
-    ensure_file, load_json, save_json,
+    ensure_file, load_json, save_json, async_load_json, async_save_json,
     # User metadata
-    get_user_meta, set_user_meta,
+    get_user_meta, set_user_meta, async_get_user_meta, async_set_user_meta,
     # Economy functions
     get_balance, add_money, set_money, add_bank, set_bank,
+    async_get_balance, async_add_money, async_set_money,
+    async_add_bank, async_set_bank,
     # Database initialization
     init_default_jobs, check_migration_needed, migrate_from_json
 )
@@ -35,13 +40,19 @@ BOT_OWNER_ID = os.getenv("BOT_OWNER_ID")  # bot owner ID for admin commands
 if not TOKEN:
     raise RuntimeError("DISCORD_TOKEN not found in environment (.env).")
 
+logger = logging.getLogger('main_db')
+
 # Files & constants (use stable data directory anchored to this file)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+@lru_cache(maxsize=None)
 def _abs_data_path(path: str) -> str:
-    # Map any relative filename into the data directory
+    # Map any relative filename into the data directory. The same
+    # dozen-odd filenames come through on every call site, so memoize
+    # the isabs/join work; the cache stays bounded by the constant set
+    # of file names.
     return path if os.path.isabs(path) else os.path.join(DATA_DIR, path)
 
 # File paths (for backward compatibility)
@@ -72,6 +83,42 @@ TOURNAMENTS_FILE_PATH = _abs_data_path(TOURNAMENTS_FILE)
 
 MONEY_ICON = "<:SpiritStonesPurple:1353660935465599086>"
 
+# In-memory state tables, keyed by the attribute name they get on the
+# bot object. load_state(bot) pulls each table out of storage once at
+# startup; command handlers read bot.store / bot.jobs / ... directly,
+# call mark_dirty(bot, "store") after mutating, and a periodic task
+# (plus the shutdown path) calls flush_state(bot) to write back only
+# the tables that actually changed - instead of a full JSON round trip
+# on the event loop for every command.
+STATE_FILES = {
+    "economy": DATA_FILE_PATH,
+    "income_roles": INCOME_FILE_PATH,
+    "store": STORE_FILE_PATH,
+    "jobs": JOBS_FILE_PATH,
+    "auctions": AUCTIONS_FILE_PATH,
+    "loot_roles": LOOT_ROLES_FILE_PATH,
+    "sects": SECTS_FILE_PATH,
+    "cases": CASES_FILE_PATH,
+    "case_items": CASE_ITEMS_FILE_PATH,
+    "tournaments": TOURNAMENTS_FILE_PATH,
+}
+
+async def load_state(bot):
+    """Load every JSON-backed table onto the bot; call from setup_hook"""
+    for name, path in STATE_FILES.items():
+        setattr(bot, name, await async_load_json(path))
+    bot._dirty = set()
+
+def mark_dirty(bot, name: str) -> None:
+    """Flag an in-memory table for the next flush"""
+    bot._dirty.add(name)
+
+async def flush_state(bot) -> None:
+    """Write back every dirty table; call from a periodic task and on close"""
+    for name in list(bot._dirty):
+        await async_save_json(STATE_FILES[name], getattr(bot, name))
+        bot._dirty.discard(name)
+
 # Default jobs
 DEFAULT_JOBS = {
     "Farmer": [200, 400],
@@ -80,23 +127,40 @@ DEFAULT_JOBS = {
     "Merchant": [600, 800]
 }
 
-# Initialize database with default jobs
-init_default_jobs(DEFAULT_JOBS)
-
-# Check if migration is needed
-if check_migration_needed():
-    print("\n===== MIGRATION NOTICE =====\n")
-    print("It appears you have JSON data files but your database is empty.")
-    print("You may want to run the migration script to transfer your data:")
-    print("  python migrate.py run")
-    print("\nThis will preserve all your bot data when transferring to a new host or updating.")
-    print("===========================\n")
+# Check if migration is needed. One warning through the logger instead
+# of a multi-line print banner; SKIP_MIGRATION_CHECK=1 skips the check
+# entirely for deployments that have long since migrated.
+if os.getenv("SKIP_MIGRATION_CHECK", "0") != "1" and check_migration_needed():
+    logger.warning(
+        "JSON data files found but the database is empty - run "
+        "'python migrate.py run' to transfer your data before starting the bot"
+    )
 
 # Case system constants
 CASE_MARKET_COOLDOWN = 10  # seconds
 CASE_EMOJI = "🎁"
 CASE_COLOR = 0x9b59b6  # Purple
-CASE_COOLDOWNS = {}  # User ID -> {case_key -> timestamp}
+# Flat (user_id, case_key) -> monotonic expiry. One dict probe per
+# check instead of a nested per-user dict, and time.monotonic() is
+# immune to wall-clock adjustments.
+CASE_COOLDOWNS: Dict[Tuple[int, str], float] = {}
+
+def check_case_cooldown(user_id: int, case_key: str,
+                        seconds: float = CASE_MARKET_COOLDOWN) -> float:
+    """Return seconds left on a cooldown, arming it if it was ready (0.0)"""
+    now = time.monotonic()
+    expiry = CASE_COOLDOWNS.get((user_id, case_key), 0.0)
+    if expiry > now:
+        return expiry - now
+    CASE_COOLDOWNS[(user_id, case_key)] = now + seconds
+    return 0.0
+
+def prune_case_cooldowns() -> None:
+    """Drop expired entries; call occasionally from a background task"""
+    now = time.monotonic()
+    expired = [key for key, expiry in CASE_COOLDOWNS.items() if expiry <= now]
+    for key in expired:
+        del CASE_COOLDOWNS[key]
 
 # Job System Constants
 JOB_RANKS = {
@@ -110,6 +174,20 @@ JOB_RANKS = {
 # Job progression multipliers for message requirements
 JOB_PROGRESSION_MULTIPLIERS = [2, 3, 4, 5, 6, 7, 8, 9, 10]
 
+# Rank thresholds flattened for binary search: _RANK_NAMES[i] applies
+# from _RANK_XP[i] until the next threshold. JOB_RANKS stays the source
+# of truth; dicts preserve insertion order so the two line up.
+_RANK_NAMES: Tuple[str, ...] = tuple(JOB_RANKS)
+_RANK_XP: List[int] = [spec["xp_required"] for spec in JOB_RANKS.values()]
+
+def rank_for_xp(xp: int) -> str:
+    """Return the job rank name for an XP total.
+
+    One bisect over the precomputed thresholds instead of walking
+    JOB_RANKS and comparing per entry on every lookup.
+    """
+    return _RANK_NAMES[max(bisect.bisect_right(_RANK_XP, xp) - 1, 0)]
+
 # Job-specific crafting items and their base rarities
 JOB_CRAFTING_ITEMS = {
     "Blacksmith": {
@@ -222,16 +300,66 @@ JOB_CRAFTING_ITEMS = {
     }
 }
 
-# Create files if missing (for backward compatibility)
-ensure_file(DATA_FILE_PATH, {})
-ensure_file(INCOME_FILE_PATH, {})
-ensure_file(STORE_FILE_PATH, {})
-ensure_file(JOBS_FILE_PATH, DEFAULT_JOBS)
-ensure_file(AUCTIONS_FILE_PATH, {})
-ensure_file(LOOT_ROLES_FILE_PATH, {})
-ensure_file(CASES_FILE_PATH, {})
-ensure_file(CASE_ITEMS_FILE_PATH, {})
-ensure_file(TOURNAMENTS_FILE_PATH, {})
+# Intern the crafting strings before any derived table copies them:
+# item names and rarities recur across inventories, embeds and equality
+# checks, so sharing one object per distinct string trims memory and
+# lets == short-circuit on identity.
+for _ranks in JOB_CRAFTING_ITEMS.values():
+    for _spec in _ranks.values():
+        _spec["items"] = [sys.intern(item) for item in _spec["items"]]
+        _spec["base_rarity"] = sys.intern(_spec["base_rarity"])
+del _ranks, _spec
+
+# Flattened lookup for the crafting hot path: one dict probe on
+# (job, rank) instead of two nested lookups per roll, with the item
+# pool as a tuple ready for random.choice.
+_CRAFT_TABLE: Dict[Tuple[str, str], Tuple[tuple, str, float]] = {
+    (job, rank): (tuple(spec["items"]), spec["base_rarity"], spec["quality_chance"])
+    for job, ranks in JOB_CRAFTING_ITEMS.items()
+    for rank, spec in ranks.items()
+}
+
+def _make_roller(items: tuple, rarity: str, quality_chance: float):
+    # Specialize one closure per (job, rank): the item pool, rarity and
+    # threshold become cell variables and the rng methods locals, so a
+    # roll does no dict probes or tuple unpacking of its own.
+    choice = random.choice
+    rand = random.random
+    def roll() -> Tuple[str, str, bool]:
+        return choice(items), rarity, rand() < quality_chance
+    return roll
+
+_ROLLERS = {key: _make_roller(*spec) for key, spec in _CRAFT_TABLE.items()}
+
+def roll_craft(job: str, rank: str, rng=random) -> Optional[Tuple[str, str, bool]]:
+    """Roll a crafted item for (job, rank) -> (item, rarity, is_quality)"""
+    if rng is random:
+        roller = _ROLLERS.get((job, rank))
+        return roller() if roller is not None else None
+    # Custom rng (seeded tests): take the generic path
+    spec = _CRAFT_TABLE.get((job, rank))
+    if spec is None:
+        return None
+    items, rarity, quality_chance = spec
+    return rng.choice(items), rarity, rng.random() < quality_chance
+
+# The database is the source of truth now, so the legacy JSON mirror is
+# opt-in: set MAINTAIN_JSON_MIRROR=1 to keep seeding the old files (nine
+# stat calls and up to nine writes at import otherwise spent on files
+# nothing reads).
+MAINTAIN_JSON_MIRROR = os.getenv("MAINTAIN_JSON_MIRROR", "0") == "1"
+
+def bootstrap_defaults() -> None:
+    """One-shot startup seeding: default jobs, plus the legacy JSON
+    mirror when enabled. Everything that used to run piecemeal at import
+    lives here so there is a single place that knows what a fresh
+    deployment needs."""
+    init_default_jobs(DEFAULT_JOBS)
+    if MAINTAIN_JSON_MIRROR:
+        for path in STATE_FILES.values():
+            ensure_file(path, DEFAULT_JOBS if path == JOBS_FILE_PATH else {})
+
+bootstrap_defaults()
 
 # ---- Preconfigured special roles (Axes) ----
 # Update these IDs to your guild's roles if they differ.
@@ -248,6 +376,66 @@ REALM_ROLE_IDS_PRIORITY: List[int] = [
     1360611957643804856,
 ]
 
+# Frozenset views for membership tests; the structures above stay the
+# source of truth for priority order and per-axis meaning.
+_REALM_SET = frozenset(REALM_ROLE_IDS_PRIORITY)
+_AXIS_SET = frozenset((
+    AXIS_HEALTH_ROLE_ID,
+    AXIS_WEALTH_ROLE_ID,
+    AXIS_LONGEVITY_ROLE_ID,
+    AXIS_LOVE_VIRTUE_ROLE_ID,
+))
+
+def realm_role(member) -> Optional[discord.Role]:
+    """Return the member's highest-priority realm override role, if any.
+
+    One pass over member.roles with O(1) set membership, then the winner
+    is picked by position in REALM_ROLE_IDS_PRIORITY - instead of one
+    scan of the role list per priority entry.
+    """
+    found = {role.id: role for role in member.roles if role.id in _REALM_SET}
+    if not found:
+        return None
+    for role_id in REALM_ROLE_IDS_PRIORITY:
+        role = found.get(role_id)
+        if role is not None:
+            return role
+    return None
+
+def axis_roles(member) -> List[discord.Role]:
+    """Return the member's Axis roles in their role-list order"""
+    return [role for role in member.roles if role.id in _AXIS_SET]
+
+# Bit per tracked special role. role_mask packs a member's whole
+# realm/axis membership into one int, so code that checks several of
+# these roles for the same member does one pass over member.roles and
+# then cheap mask tests, instead of re-scanning the role list per check.
+_TRACKED_ROLE_IDS: Tuple[int, ...] = tuple(REALM_ROLE_IDS_PRIORITY) + (
+    AXIS_HEALTH_ROLE_ID,
+    AXIS_WEALTH_ROLE_ID,
+    AXIS_LONGEVITY_ROLE_ID,
+    AXIS_LOVE_VIRTUE_ROLE_ID,
+)
+_ROLE_BIT: Dict[int, int] = {role_id: 1 << i for i, role_id in enumerate(_TRACKED_ROLE_IDS)}
+_REALM_MASK = sum(_ROLE_BIT[role_id] for role_id in REALM_ROLE_IDS_PRIORITY)
+_AXIS_MASK = sum(_ROLE_BIT[role_id] for role_id in _AXIS_SET)
+
+def role_mask(member) -> int:
+    """Pack the member's tracked realm/axis roles into an int bitmask"""
+    mask = 0
+    get = _ROLE_BIT.get
+    for role in member.roles:
+        bit = get(role.id)
+        if bit:
+            mask |= bit
+    return mask
+
+def has_realm_override(mask: int) -> bool:
+    return bool(mask & _REALM_MASK)
+
+def has_axis_role(mask: int, role_id: int) -> bool:
+    return bool(mask & _ROLE_BIT.get(role_id, 0))
+
 # The rest of your main.py file follows here...
 # You'll need to copy the remaining code from your original main.py file
 # and replace any direct calls to load_json, save_json, get_user_meta, set_user_meta,
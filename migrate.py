@@ -3,6 +3,7 @@ import os
 import sys
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from database import migrate_json_to_db
 
@@ -34,15 +35,21 @@ def backup_json_files():
         "tournaments.json"
     ]
     
-    # Copy files to backup directory
-    for file_name in json_files:
-        if os.path.exists(file_name):
-            try:
-                shutil.copy2(file_name, os.path.join(backup_dir, file_name))
-                logger.info(f"Backed up {file_name} to {backup_dir}")
-            except Exception as e:
-                logger.error(f"Failed to backup {file_name}: {e}")
-    
+    def backup_one(file_name):
+        try:
+            shutil.copy2(file_name, os.path.join(backup_dir, file_name))
+            logger.info(f"Backed up {file_name} to {backup_dir}")
+        except Exception as e:
+            logger.error(f"Failed to backup {file_name}: {e}")
+
+    # Copy files to backup directory in parallel - the copies are
+    # independent and the time is dominated by disk waits
+    to_copy = [f for f in json_files if os.path.exists(f)]
+    if to_copy:
+        with ThreadPoolExecutor(max_workers=min(4, len(to_copy))) as pool:
+            for file_name in to_copy:
+                pool.submit(backup_one, file_name)
+
     return backup_dir
 
 def run_migration():
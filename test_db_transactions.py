@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Regression test for cross-thread transaction isolation"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add the current directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import Database
+
+
+def test_cross_thread_isolation():
+    """A thread must never join another thread's open transaction.
+
+    Regression: when the nesting depth was plain instance state, a
+    second thread saw the first thread's open transaction, "joined" it
+    without holding the write lock, and its statements shared the other
+    thread's commit/rollback fate.
+    """
+    print("🧪 Testing cross-thread transaction isolation...")
+
+    tmp_dir = tempfile.mkdtemp()
+    db = Database(os.path.join(tmp_dir, "test.db"))
+    db.set_cash(1, 0)
+
+    entered = threading.Event()
+    release = threading.Event()
+
+    def holder():
+        # Open a transaction, wait, then force a rollback
+        try:
+            with db.transaction():
+                db.add_cash(1, 50)
+                entered.set()
+                release.wait(5)
+                raise RuntimeError("force rollback")
+        except RuntimeError:
+            pass
+
+    t_holder = threading.Thread(target=holder)
+    t_holder.start()
+    entered.wait(5)
+
+    other_done = threading.Event()
+
+    def other():
+        # Must block until the holder's transaction is over, then get a
+        # transaction (and a commit) of its own
+        with db.transaction():
+            db.add_cash(42, 100)
+        other_done.set()
+
+    t_other = threading.Thread(target=other)
+    t_other.start()
+    time.sleep(0.3)
+    blocked_while_held = not other_done.is_set()
+
+    release.set()
+    t_holder.join(5)
+    t_other.join(5)
+
+    ok = True
+    if not blocked_while_held:
+        print("❌ Second thread ran inside the first thread's transaction")
+        ok = False
+    if db.get_balance(1)[0] != 0:
+        print(f"❌ Rolled-back write leaked: {db.get_balance(1)}")
+        ok = False
+    if db.get_balance(42)[0] != 100:
+        print(f"❌ Second thread's committed write lost: {db.get_balance(42)}")
+        ok = False
+    if ok:
+        print("✅ Cross-thread transactions stay isolated")
+
+    db.close()
+    return ok
+
+
+if __name__ == "__main__":
+    success = test_cross_thread_isolation()
+    if success:
+        print("🎉 Transaction isolation test PASSED!")
+        sys.exit(0)
+    else:
+        print("💥 Transaction isolation test FAILED!")
+        sys.exit(1)
@@ -3,13 +3,15 @@
 
 import sys
 import os
+import tempfile
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import the functions we want to test
+import main
 from main import (
-    save_user_inventory, 
+    save_user_inventory,
     load_user_inventory,
     save_user_equipment,
     load_user_equipment,
@@ -18,10 +20,32 @@ from main import (
     ensure_json_files
 )
 
+# The user data file constants on main
+_USER_FILE_VARS = [
+    "USER_INVENTORIES_FILE",
+    "USER_EQUIPMENT_FILE",
+    "USER_ATTRIBUTES_FILE",
+    "USER_SECTS_FILE",
+    "USER_JOBS_FILE",
+    "USER_IMMORTAL_ARTS_FILE",
+    "USER_STATS_FILE",
+]
+
+def use_scratch_dir(tmp_dir):
+    """Point every user data file at a throwaway directory.
+
+    Keeps the test from rewriting the live data/ files on each run -
+    all reads and writes stay inside tmp_dir, which is deleted when
+    the test finishes.
+    """
+    for var_name in _USER_FILE_VARS:
+        file_name = os.path.basename(getattr(main, var_name))
+        setattr(main, var_name, os.path.join(tmp_dir, file_name))
+
 def test_json_system():
     """Test the JSON system"""
     print("🧪 Testing JSON system...")
-    
+
     # Ensure files exist
     ensure_json_files()
     print("✅ JSON files ensured")
@@ -74,7 +98,9 @@ def test_json_system():
         return False
 
 if __name__ == "__main__":
-    success = test_json_system()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        use_scratch_dir(tmp_dir)
+        success = test_json_system()
     if success:
         print("🎉 JSON system test PASSED!")
         sys.exit(0)